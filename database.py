@@ -16,8 +16,10 @@ context managers for safe transaction handling.
 import sqlite3
 import json
 import logging
+import math
+import threading
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from contextlib import contextmanager
 import os
 
@@ -43,6 +45,11 @@ class TradingDatabase:
             db_path: Path to SQLite database file (default: 'data/trading_bot.db')
         """
         self.db_path = db_path
+        # One connection per thread, reused across get_connection() calls;
+        # a thread's connection is closed when that thread exits
+        self._local = threading.local()
+        # Set by migrate_schema once the manual-closure unique index exists
+        self._manual_closure_unique = False
         self.init_database()
     
     def init_database(self):
@@ -52,30 +59,71 @@ class TradingDatabase:
         indexes, and performs any necessary schema migrations.
         """
         with self.get_connection() as conn:
+            # WAL lets the dashboard read while the bot writes; the setting
+            # is stored in the database file, so it only needs to be set once
+            conn.execute('PRAGMA journal_mode=WAL')
             self.create_tables(conn)
             self.migrate_schema(conn)
             logger.info(f"Database initialized: {self.db_path}")
     
+    def _thread_connection(self) -> sqlite3.Connection:
+        """Get the calling thread's connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path)
+            conn.row_factory = sqlite3.Row  # Enable column access by name
+            # synchronous stays at the default (FULL) so committed trades survive power loss
+            conn.execute('PRAGMA temp_store=MEMORY')
+            self._local.conn = conn
+        return conn
+    
     @contextmanager
     def get_connection(self):
         """Context manager for database connections
         
         Provides safe database access with automatic transaction handling.
-        Commits on success, rolls back on exceptions, and always closes connections.
+        Commits on success and rolls back on exceptions. Each thread keeps
+        its own connection open between calls, so concurrent readers under
+        WAL don't contend and no call pays for opening a new connection.
+        
+        Because a thread's blocks share one connection, a block nested inside
+        another runs in a savepoint: it releases or rolls back only its own
+        work and leaves the commit to the outermost block.
         
         Yields:
             sqlite3.Connection: Database connection with row factory enabled
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row  # Enable column access by name
+        conn = self._thread_connection()
+        depth = getattr(self._local, 'depth', 0)
+        savepoint = f'nested_{depth}' if depth else None
+        if savepoint:
+            conn.execute(f'SAVEPOINT {savepoint}')
+        self._local.depth = depth + 1
         try:
             yield conn
-            conn.commit()
+            if savepoint:
+                conn.execute(f'RELEASE {savepoint}')
+            else:
+                conn.commit()
         except Exception as e:
-            conn.rollback()
+            if savepoint:
+                conn.execute(f'ROLLBACK TO {savepoint}')
+                conn.execute(f'RELEASE {savepoint}')
+            else:
+                conn.rollback()
             logger.error(f"Database error: {e}")
             raise
         finally:
+            self._local.depth = depth
+    
+    def close(self):
+        """Close the calling thread's connection
+        
+        The next get_connection() call on this thread opens a new one.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            self._local.conn = None
             conn.close()
     
     def migrate_schema(self, conn):
@@ -87,6 +135,15 @@ class TradingDatabase:
         Args:
             conn: SQLite database connection
         """
+        try:
+            # Take the write lock up front so concurrent processes migrate one at a time
+            if not conn.in_transaction:
+                conn.execute('BEGIN IMMEDIATE')
+        except sqlite3.OperationalError as e:
+            # e.g. "database is locked"; log and start without migrating, as before
+            logger.error(f"Error migrating database schema: {e}")
+            return
+        
         try:
             # Check if rl_enhanced column exists
             cursor = conn.execute("PRAGMA table_info(signals)")
@@ -100,8 +157,24 @@ class TradingDatabase:
             if not cursor.fetchone():
                 logger.info("Creating market_context table for cross-asset data.")
                 self.create_market_context_table(conn)
+            
+            # Index for newest-first market context reads (dashboard polling)
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_market_context_created_at ON market_context(created_at DESC)')
         except Exception as e:
             logger.error(f"Error migrating database schema: {e}")
+        
+        try:
+            # Enforce one manual closure per (timestamp, quantity), the key the
+            # old lookup used, so record_manual_closure can use INSERT OR IGNORE.
+            # Only MANUAL_ rows are covered; other trades may share both values.
+            conn.execute('''
+                CREATE UNIQUE INDEX IF NOT EXISTS uq_trades_manual_closure
+                ON trades(timestamp, quantity) WHERE order_id GLOB 'MANUAL_*'
+            ''')
+            self._manual_closure_unique = True
+        except sqlite3.Error as e:
+            logger.error(f"Could not create unique manual closure index, "
+                         f"manual closures will be deduplicated by lookup: {e}")
     
     def create_market_context_table(self, conn):
         """Create market_context table for storing cross-asset correlation data
@@ -232,9 +305,12 @@ class TradingDatabase:
         # Create indexes for query optimization on frequently accessed columns
         conn.execute('CREATE INDEX IF NOT EXISTS idx_signals_timestamp ON signals(timestamp)')
         conn.execute('CREATE INDEX IF NOT EXISTS idx_signals_symbol ON signals(symbol)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_signals_symbol_timestamp ON signals(symbol, timestamp DESC)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_signals_symbol_rl_timestamp ON signals(symbol, rl_enhanced, timestamp DESC)')
         conn.execute('CREATE INDEX IF NOT EXISTS idx_trades_timestamp ON trades(timestamp)')
         conn.execute('CREATE INDEX IF NOT EXISTS idx_trades_symbol ON trades(symbol)')
         conn.execute('CREATE INDEX IF NOT EXISTS idx_trades_status ON trades(status)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_trades_symbol_status_timestamp ON trades(symbol, status, timestamp, pnl)')
         conn.execute('CREATE INDEX IF NOT EXISTS idx_market_data_timestamp ON market_data(timestamp)')
         
         logger.info("Database tables created/verified")
@@ -254,6 +330,10 @@ class TradingDatabase:
             int: Database ID of stored signal (0 if failed)
         """
         try:
+            # Serialize before opening the connection to keep the write transaction short
+            reasons_json = json.dumps(signal_data.get('reasons', []))
+            indicators_json = json.dumps(signal_data.get('indicators', {}))
+            
             with self.get_connection() as conn:
                 cursor = conn.execute('''
                     INSERT INTO signals (symbol, price, signal, strength, reasons, indicators, rl_enhanced)
@@ -263,8 +343,8 @@ class TradingDatabase:
                     price,
                     signal_data.get('signal', 0),
                     signal_data.get('strength', 0),
-                    json.dumps(signal_data.get('reasons', [])),
-                    json.dumps(signal_data.get('indicators', {})),
+                    reasons_json,
+                    indicators_json,
                     signal_data.get('rl_enhanced', False)
                 ))
                 signal_id = cursor.lastrowid
@@ -350,6 +430,35 @@ class TradingDatabase:
         except Exception as e:
             logger.error(f"Error updating trade: {e}")
     
+    def bulk_update_trade_exits(self, exits: List[Tuple[float, float, float, str, int]]) -> int:
+        """Update many trades with exit information in one transaction
+        
+        Batch counterpart of update_trade_exit for reconciliation, where
+        every open trade is closed at once. All rows are written with a
+        single executemany and committed together.
+        
+        Args:
+            exits: (exit_price, pnl, pnl_percentage, status, trade_id) per trade
+            
+        Returns:
+            int: Number of trades updated (0 on error)
+        """
+        if not exits:
+            return 0
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.executemany('''
+                    UPDATE trades 
+                    SET exit_price = ?, pnl = ?, pnl_percentage = ?, status = ?, 
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                ''', exits)
+                logger.info(f"Trades updated: {cursor.rowcount} exits written")
+                return cursor.rowcount
+        except Exception as e:
+            logger.error(f"Error bulk updating trades: {e}")
+            return 0
+    
     def store_market_data(self, symbol: str, timeframe: str, ohlcv_data: List[Dict]):
         """Store market data for analysis
         
@@ -382,6 +491,45 @@ class TradingDatabase:
         except Exception as e:
             logger.error(f"Error storing market data: {e}")
     
+    def _fetch_signals(self, symbol: Optional[str], limit: int, rl_only: bool) -> List[Dict]:
+        """Fetch recent signals newest-first with parsed JSON fields
+        
+        Builds the WHERE clause from the supplied filters (rather than
+        'symbol = ? OR ? IS NULL') so SQLite can use idx_signals_symbol_timestamp,
+        or idx_signals_symbol_rl_timestamp for rl_only queries.
+        
+        Args:
+            symbol: Filter by trading pair (None for all symbols)
+            limit: Maximum number of signals to return
+            rl_only: Only return RL-enhanced signals
+            
+        Returns:
+            List[Dict]: Recent signals with parsed reasons and indicators
+        """
+        conditions = []
+        params = []
+        if symbol is not None:
+            conditions.append('symbol = ?')
+            params.append(symbol)
+        if rl_only:
+            conditions.append('rl_enhanced = 1')
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        
+        with self.get_connection() as conn:
+            cursor = conn.execute(f'''
+                SELECT * FROM signals 
+                {where}
+                ORDER BY timestamp DESC 
+                LIMIT ?
+            ''', (*params, limit))
+            signals = []
+            for row in cursor.fetchall():
+                signal = dict(row)
+                signal['reasons'] = json.loads(signal['reasons']) if signal['reasons'] else []
+                signal['indicators'] = json.loads(signal['indicators']) if signal['indicators'] else {}
+                signals.append(signal)
+            return signals
+    
     def get_recent_signals(self, symbol: str = None, limit: int = 10) -> List[Dict]:
         """Get recent signals from database
         
@@ -396,21 +544,7 @@ class TradingDatabase:
             List[Dict]: Recent signals with parsed reasons and indicators
         """
         try:
-            with self.get_connection() as conn:
-                query = '''
-                    SELECT * FROM signals 
-                    WHERE symbol = ? OR ? IS NULL
-                    ORDER BY timestamp DESC 
-                    LIMIT ?
-                '''
-                cursor = conn.execute(query, (symbol, symbol, limit))
-                signals = []
-                for row in cursor.fetchall():
-                    signal = dict(row)
-                    signal['reasons'] = json.loads(signal['reasons']) if signal['reasons'] else []
-                    signal['indicators'] = json.loads(signal['indicators']) if signal['indicators'] else {}
-                    signals.append(signal)
-                return signals
+            return self._fetch_signals(symbol, limit, rl_only=False)
         except Exception as e:
             logger.error(f"Error getting recent signals: {e}")
             return []
@@ -429,21 +563,7 @@ class TradingDatabase:
             List[Dict]: Recent RL-enhanced signals with parsed data
         """
         try:
-            with self.get_connection() as conn:
-                query = '''
-                    SELECT * FROM signals 
-                    WHERE (symbol = ? OR ? IS NULL) AND rl_enhanced = 1
-                    ORDER BY timestamp DESC 
-                    LIMIT ?
-                '''
-                cursor = conn.execute(query, (symbol, symbol, limit))
-                signals = []
-                for row in cursor.fetchall():
-                    signal = dict(row)
-                    signal['reasons'] = json.loads(signal['reasons']) if signal['reasons'] else []
-                    signal['indicators'] = json.loads(signal['indicators']) if signal['indicators'] else {}
-                    signals.append(signal)
-                return signals
+            return self._fetch_signals(symbol, limit, rl_only=True)
         except Exception as e:
             logger.error(f"Error getting recent RL signals: {e}")
             return []
@@ -477,7 +597,7 @@ class TradingDatabase:
             logger.error(f"Error getting recent trades: {e}")
             return []
     
-    def get_open_trades(self, symbol: str = None) -> List[Dict]:
+    def get_open_trades(self, symbol: str = None, oldest_first: bool = False) -> List[Dict]:
         """Get currently open trades
         
         Retrieves all trades with 'OPEN' status for position tracking
@@ -485,16 +605,19 @@ class TradingDatabase:
         
         Args:
             symbol: Filter by trading pair (None for all symbols)
+            oldest_first: Return trades in FIFO order (oldest first) instead of
+                newest first; sorting is done by SQLite using the
+                (symbol, status, timestamp) index
             
         Returns:
             List[Dict]: Currently open trades
         """
         try:
             with self.get_connection() as conn:
-                query = '''
+                query = f'''
                     SELECT * FROM trades 
                     WHERE status = 'OPEN' AND (symbol = ? OR ? IS NULL)
-                    ORDER BY timestamp DESC
+                    ORDER BY timestamp {'ASC' if oldest_first else 'DESC'}
                 '''
                 cursor = conn.execute(query, (symbol, symbol))
                 return [dict(row) for row in cursor.fetchall()]
@@ -502,6 +625,65 @@ class TradingDatabase:
             logger.error(f"Error getting open trades: {e}")
             return []
     
+    def get_open_trades_arrays(self, symbol: str = None, oldest_first: bool = False):
+        """Get currently open trades as a column-oriented NumPy array
+        
+        Reconciliation only needs a few columns of each open trade, and
+        works on them as whole columns; this skips building a dict per row.
+        
+        Args:
+            symbol: Filter by trading pair (None for all symbols)
+            oldest_first: Return trades in FIFO order (oldest first)
+            
+        Returns:
+            np.ndarray: Structured array with fields id, side, quantity and
+            entry_price, in the same order as get_open_trades
+        """
+        import numpy as np
+        dtype = [('id', 'i8'), ('side', 'U4'), ('quantity', 'f8'), ('entry_price', 'f8')]
+        try:
+            with self.get_connection() as conn:
+                query = f'''
+                    SELECT id, side, quantity, entry_price FROM trades 
+                    WHERE status = 'OPEN' AND (symbol = ? OR ? IS NULL)
+                    ORDER BY timestamp {'ASC' if oldest_first else 'DESC'}
+                '''
+                cursor = conn.execute(query, (symbol, symbol))
+                return np.fromiter((tuple(row) for row in cursor), dtype=dtype)
+        except Exception as e:
+            logger.error(f"Error getting open trades: {e}")
+            return np.empty(0, dtype=dtype)
+    
+    def get_position_summary(self, symbol: str) -> Dict[str, Tuple[float, int]]:
+        """Get net position and trade count per status in one query
+        
+        Used by reconciliation to verify the database against Binance
+        without re-reading every open trade.
+        
+        Args:
+            symbol: Trading pair to summarize
+            
+        Returns:
+            Dict[str, Tuple[float, int]]: status -> (net quantity, trade count),
+            where BUY adds and SELL subtracts; OPEN and CLOSED are always present
+        """
+        summary = {'OPEN': (0.0, 0), 'CLOSED': (0.0, 0)}
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.execute('''
+                    SELECT status,
+                           COALESCE(SUM(CASE WHEN side = 'BUY' THEN quantity ELSE -quantity END), 0) as net,
+                           COUNT(*) as count
+                    FROM trades
+                    WHERE symbol = ?
+                    GROUP BY status
+                ''', (symbol,))
+                for row in cursor.fetchall():
+                    summary[row['status']] = (float(row['net']), row['count'])
+        except Exception as e:
+            logger.error(f"Error getting position summary: {e}")
+        return summary
+    
     def calculate_performance_metrics(self, symbol: str, days: int = 30) -> Dict:
         """Calculate comprehensive performance metrics for given period
         
@@ -520,31 +702,34 @@ class TradingDatabase:
                 query = '''
                     SELECT 
                         COUNT(*) as total_trades,
-                        SUM(CASE WHEN pnl > 0 THEN 1 ELSE 0 END) as winning_trades,
-                        SUM(CASE WHEN pnl < 0 THEN 1 ELSE 0 END) as losing_trades,
-                        SUM(pnl) as total_pnl,
-                        AVG(CASE WHEN pnl > 0 THEN pnl ELSE NULL END) as avg_win,
-                        AVG(CASE WHEN pnl < 0 THEN pnl ELSE NULL END) as avg_loss,
-                        MIN(pnl) as max_loss
+                        COALESCE(SUM(CASE WHEN pnl > 0 THEN 1 ELSE 0 END), 0) as winning_trades,
+                        COALESCE(SUM(CASE WHEN pnl < 0 THEN 1 ELSE 0 END), 0) as losing_trades,
+                        CAST(SUM(CASE WHEN pnl > 0 THEN 1 ELSE 0 END) AS REAL) * 100
+                            / NULLIF(COUNT(*), 0) as win_rate,
+                        COALESCE(SUM(pnl), 0) as total_pnl,
+                        COALESCE(AVG(CASE WHEN pnl > 0 THEN pnl ELSE NULL END), 0) as avg_win,
+                        COALESCE(AVG(CASE WHEN pnl < 0 THEN pnl ELSE NULL END), 0) as avg_loss,
+                        COALESCE(MIN(pnl), 0) as max_loss
                     FROM trades 
                     WHERE symbol = ? AND status = 'CLOSED' 
-                    AND timestamp >= datetime('now', '-{} days')
-                '''.format(days)
+                    AND timestamp >= datetime('now', ?)
+                '''
                 
-                cursor = conn.execute(query, (symbol,))
+                cursor = conn.execute(query, (symbol, f'-{int(days)} days'))
                 row = cursor.fetchone()
                 
                 if row and row['total_trades'] > 0:
-                    win_rate = (row['winning_trades'] / row['total_trades']) * 100
+                    metrics = dict(row)
+                    win_rate = metrics['win_rate']
+                    avg_win = metrics['avg_win']
+                    avg_loss = metrics['avg_loss']
                     
                     # Calculate future projections using historical performance trends
-                    avg_daily_pnl = (row['total_pnl'] or 0) / days if days > 0 else 0
-                    avg_win = row['avg_win'] or 0
-                    avg_loss = row['avg_loss'] or 0
+                    avg_daily_pnl = metrics['total_pnl'] / days if days > 0 else 0
                     
                     # Project for 90 days
                     projection_days = 90
-                    expected_trades_90d = (row['total_trades'] / days) * projection_days if days > 0 else 0
+                    expected_trades_90d = (metrics['total_trades'] / days) * projection_days if days > 0 else 0
                     
                     # Best case: assume higher win rate and average wins
                     best_case_wins = expected_trades_90d * min(win_rate * 1.2, 100) / 100
@@ -559,21 +744,13 @@ class TradingDatabase:
                     # Expected case: current performance trends
                     expected_pnl_90d = avg_daily_pnl * projection_days
                     
-                    return {
-                        'total_trades': row['total_trades'],
-                        'winning_trades': row['winning_trades'] or 0,
-                        'losing_trades': row['losing_trades'] or 0,
-                        'win_rate': win_rate,
-                        'total_pnl': row['total_pnl'] or 0,
-                        'avg_win': avg_win,
-                        'avg_loss': avg_loss,
-                        'max_loss': row['max_loss'] or 0,
+                    return metrics | {
                         'days': days,
                         'projections': {
                             'best_case_90d': round(best_case_pnl, 2),
                             'worst_case_90d': round(worst_case_pnl, 2),
                             'expected_90d': round(expected_pnl_90d, 2),
-                            'confidence': min(row['total_trades'] * 2, 100)  # Higher confidence with more trades
+                            'confidence': min(metrics['total_trades'] * 2, 100)  # Higher confidence with more trades
                         }
                     }
                 else:
@@ -583,6 +760,34 @@ class TradingDatabase:
             logger.error(f"Error calculating performance: {e}")
             return {'error': str(e)}
     
+    def _chunked_delete(self, conn, table: str, where: str, params: tuple = (), chunk: int = 1000) -> int:
+        """Delete matching rows in small batches, committing between batches
+        
+        Keeps each write transaction short so other writers (signal logger,
+        dashboard) are not blocked for the duration of a large cleanup.
+        
+        Args:
+            conn: SQLite database connection
+            table: Table to delete from
+            where: SQL predicate selecting the rows to delete
+            params: Bound parameters for the predicate
+            chunk: Maximum number of rows deleted per batch
+        
+        Returns:
+            int: Total number of rows deleted
+        """
+        query = f'''
+            DELETE FROM {table}
+            WHERE rowid IN (SELECT rowid FROM {table} WHERE {where} LIMIT ?)
+        '''
+        total = 0
+        while True:
+            cursor = conn.execute(query, (*params, chunk))
+            conn.commit()
+            total += cursor.rowcount
+            if cursor.rowcount < chunk:
+                return total
+    
     def cleanup_old_data(self, days_to_keep: int = 90):
         """Clean up old data to keep database size manageable
         
@@ -591,38 +796,60 @@ class TradingDatabase:
         - Market data: Keep for 30 days
         - Closed trades: Keep for 1 year, open trades forever
         
+        Deletes run in chunks so the write lock is released between batches.
+        
         Args:
             days_to_keep: Number of days to retain signal data
         """
         try:
             with self.get_connection() as conn:
                 # Keep signals for 90 days
-                conn.execute('''
-                    DELETE FROM signals 
-                    WHERE timestamp < datetime('now', '-{} days')
-                '''.format(days_to_keep))
+                signals_deleted = self._chunked_delete(
+                    conn, 'signals',
+                    "timestamp < datetime('now', ?)", (f'-{int(days_to_keep)} days',)
+                )
                 
                 # Keep market data for 30 days
-                conn.execute('''
-                    DELETE FROM market_data 
-                    WHERE timestamp < datetime('now', '-30 days')
-                ''')
+                market_data_deleted = self._chunked_delete(
+                    conn, 'market_data',
+                    "timestamp < datetime('now', '-30 days')"
+                )
                 
                 # Keep closed trades for 1 year, open trades forever
-                conn.execute('''
-                    DELETE FROM trades 
-                    WHERE status = 'CLOSED' AND timestamp < datetime('now', '-365 days')
-                ''')
+                trades_deleted = self._chunked_delete(
+                    conn, 'trades',
+                    "status = 'CLOSED' AND timestamp < datetime('now', '-365 days')"
+                )
                 
-                logger.info(f"Cleaned up data older than {days_to_keep} days")
+                logger.info(f"Cleaned up data older than {days_to_keep} days "
+                            f"(signals={signals_deleted}, market_data={market_data_deleted}, "
+                            f"trades={trades_deleted})")
+            
+            self.maintenance()
         except Exception as e:
             logger.error(f"Error cleaning up old data: {e}")
     
+    def maintenance(self):
+        """Run periodic SQLite maintenance
+        
+        Refreshes query planner statistics with PRAGMA optimize and, when the
+        database runs in WAL mode, truncates the write-ahead log so it does
+        not grow without bound. Safe to call on non-WAL databases.
+        """
+        try:
+            with self.get_connection() as conn:
+                conn.execute('PRAGMA optimize')
+                conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+                logger.debug(f"Database maintenance completed: {self.db_path}")
+        except Exception as e:
+            logger.error(f"Error running database maintenance: {e}")
+    
     def export_data(self, table: str, filename: str = None) -> str:
         """Export table data to CSV file
         
         Exports complete table contents to CSV format for external analysis
-        or backup purposes.
+        or backup purposes. Rows are streamed from the cursor in batches,
+        so memory use stays flat regardless of table size.
         
         Args:
             table: Name of table to export
@@ -646,8 +873,9 @@ class TradingDatabase:
                     # Write header
                     writer.writerow([description[0] for description in cursor.description])
                     
-                    # Write data
-                    writer.writerows(cursor.fetchall())
+                    # Stream data in chunks so large tables are never fully loaded into memory
+                    for batch in iter(lambda: cursor.fetchmany(10000), []):
+                        writer.writerows(batch)
                 
                 logger.info(f"Data exported to {filename}")
                 return filename
@@ -737,15 +965,16 @@ class TradingDatabase:
         """
         try:
             with self.get_connection() as conn:
-                # Check if already exists
-                cursor = conn.execute('''
-                    SELECT id FROM trades 
-                    WHERE timestamp = ? AND side = 'SELL' AND quantity = ?
-                ''', (closure['timestamp'], closure['amount']))
-                
-                if cursor.fetchone():
-                    logger.debug(f"Manual closure already recorded: {closure['amount']} at {closure['timestamp']}")
-                    return False
+                if not self._manual_closure_unique:
+                    # No unique index to rely on; check for an existing record first
+                    cursor = conn.execute('''
+                        SELECT id FROM trades 
+                        WHERE timestamp = ? AND side = 'SELL' AND quantity = ?
+                    ''', (closure['timestamp'], closure['amount']))
+                    
+                    if cursor.fetchone():
+                        logger.debug(f"Manual closure already recorded: {closure['amount']} at {closure['timestamp']}")
+                        return False
                 
                 # Calculate PnL
                 pnl = (closure['exit_price'] - closure['entry_price']) * closure['amount']
@@ -755,9 +984,9 @@ class TradingDatabase:
                 ts_str = str(closure['timestamp']).replace(' ', '_').replace(':', '').replace('-', '')
                 order_id = f"MANUAL_{closure['type']}_{ts_str}"
                 
-                # Insert into database
-                conn.execute('''
-                    INSERT INTO trades (
+                # Insert into database; the unique manual closure index makes duplicates a no-op
+                cursor = conn.execute('''
+                    INSERT OR IGNORE INTO trades (
                         timestamp, symbol, side, quantity, entry_price,
                         exit_price, pnl, pnl_percentage, status, order_id,
                         created_at, updated_at
@@ -777,6 +1006,10 @@ class TradingDatabase:
                     datetime.now()
                 ))
                 
+                if cursor.rowcount != 1:
+                    logger.debug(f"Manual closure already recorded: {closure['amount']} at {closure['timestamp']}")
+                    return False
+                
                 logger.info(f"✅ Recorded {closure['type']}: {closure['amount']:.1f} @ ${closure['exit_price']:.4f}")
                 return True
                 
@@ -840,7 +1073,12 @@ class TradingDatabase:
         try:
             with self.get_connection() as conn:
                 cursor = conn.execute('''
-                    SELECT * FROM market_context
+                    SELECT id, timestamp, btc_price, btc_change_24h, btc_dominance,
+                           eth_price, eth_change_24h, fear_greed_index,
+                           volatility_regime, market_trend, correlation_signal,
+                           btc_trend, eth_btc_ratio, market_breadth,
+                           volatility_state, regime_signal, created_at
+                    FROM market_context
                     ORDER BY created_at DESC
                     LIMIT ?
                 ''', (limit,))
@@ -866,24 +1104,30 @@ class TradingDatabase:
                     SELECT btc_change_24h, eth_change_24h, market_trend,
                            volatility_regime, regime_signal
                     FROM market_context
-                    WHERE created_at >= datetime('now', '-{} hours')
+                    WHERE created_at >= datetime('now', ?)
                     ORDER BY created_at DESC
-                '''.format(hours))
+                ''', (f'-{int(hours)} hours',))
                 
                 data = [dict(row) for row in cursor.fetchall()]
                 
                 if not data:
                     return {}
                 
-                # Calculate correlation statistics
-                btc_changes = [d['btc_change_24h'] for d in data if d['btc_change_24h'] is not None]
-                eth_changes = [d['eth_change_24h'] for d in data if d['eth_change_24h'] is not None]
+                # Calculate correlation statistics with NumPy (pairwise summation keeps means accurate)
+                import numpy as np
+                btc_changes = np.array([d['btc_change_24h'] for d in data if d['btc_change_24h'] is not None], dtype=float)
+                eth_changes = np.array([d['eth_change_24h'] for d in data if d['eth_change_24h'] is not None], dtype=float)
+                avg_btc_change = float(btc_changes.mean()) if btc_changes.size else 0
+                avg_eth_change = float(eth_changes.mean()) if eth_changes.size else 0
                 
-                # Simple correlation calculation
+                # Pearson correlation from centered dot products (no 2x2 corrcoef matrix)
                 correlation = 0.0
-                if len(btc_changes) == len(eth_changes) and len(btc_changes) > 1:
-                    import numpy as np
-                    correlation = np.corrcoef(btc_changes, eth_changes)[0, 1] if len(btc_changes) > 1 else 0.0
+                if btc_changes.size == eth_changes.size and btc_changes.size > 1:
+                    btc_dev = btc_changes - avg_btc_change
+                    eth_dev = eth_changes - avg_eth_change
+                    denominator = math.sqrt((btc_dev @ btc_dev) * (eth_dev @ eth_dev))
+                    if denominator > 0:
+                        correlation = float(btc_dev @ eth_dev) / denominator
                 
                 # Trend analysis
                 trends = [d['market_trend'] for d in data if d['market_trend']]
@@ -893,8 +1137,8 @@ class TradingDatabase:
                 
                 return {
                     'btc_eth_correlation': correlation,
-                    'avg_btc_change': sum(btc_changes) / len(btc_changes) if btc_changes else 0,
-                    'avg_eth_change': sum(eth_changes) / len(eth_changes) if eth_changes else 0,
+                    'avg_btc_change': avg_btc_change,
+                    'avg_eth_change': avg_eth_change,
                     'trend_distribution': trend_counts,
                     'data_points': len(data)
                 }
@@ -903,22 +1147,30 @@ class TradingDatabase:
             logger.error(f"Error getting market context correlation: {e}")
             return {}
 
-# Singleton instance - ensures only one database connection across the application
-_db_instance = None
+# Singleton instances keyed by database path - ensures one handler per database file
+_db_instances: Dict[str, TradingDatabase] = {}
+_db_lock = threading.Lock()
 
 def get_database(db_path: str = "data/trading_bot.db") -> TradingDatabase:
     """Get singleton database instance
     
-    Returns the global database instance, creating it if necessary.
-    Ensures only one database connection is used throughout the application.
+    Returns the database instance for the given path, creating it if necessary.
+    Creation is guarded by a lock so concurrent callers never run schema
+    initialization twice for the same file. Once created, lookups skip the
+    lock, so calling this per request or per loop iteration stays cheap.
     
     Args:
-        db_path: Path to database file (only used on first call)
+        db_path: Path to database file
         
     Returns:
-        TradingDatabase: Singleton database instance
+        TradingDatabase: Singleton database instance for db_path
     """
-    global _db_instance
-    if _db_instance is None:
-        _db_instance = TradingDatabase(db_path)
-    return _db_instance
\ No newline at end of file
+    instance = _db_instances.get(db_path)
+    if instance is not None:
+        return instance
+    
+    with _db_lock:
+        instance = _db_instances.get(db_path)
+        if instance is None:
+            instance = _db_instances[db_path] = TradingDatabase(db_path)
+        return instance
@@ -5,6 +5,22 @@ Debug RL log parsing
 import re
 from datetime import datetime, timedelta
 
+# Log line patterns, compiled once at import time
+TIMESTAMP_RE = re.compile(r'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})')
+ORIGINAL_RE = re.compile(r'Original: Signal=([^,]+), Strength=(\d+)')
+RL_RE = re.compile(r'RL: Action=([^,]+), Confidence=([^%]+)')
+MARKET_RE = re.compile(r'💹 ([^:]+): \$([^|]+) \| RSI: ([^|]+) \| VWAP: \$([^$]+)')
+SIGNAL_RE = re.compile(r'🎯 Signal: [⚪🟢🔴] (\w+) \(Strength: (\d+)\)')
+
+# Checks keyed by the first character of the log message body:
+# lead character -> (substring prefilter, pattern, success message, failure message)
+LINE_DISPATCH = {
+    'O': ('Original: Signal=', ORIGINAL_RE, "Original signal: {}, strength: {}", "Original signal pattern failed"),
+    'R': ('RL: Action=', RL_RE, "RL action: {}, confidence: {}", "RL action pattern failed"),
+    '💹': ('💹 ', MARKET_RE, "Market data: {} @ ${}, RSI: {}, VWAP: ${}", "Market data pattern failed"),
+    '🎯': ('🎯 Signal:', SIGNAL_RE, "Signal: {}, strength: {}", "Signal pattern failed"),
+}
+
 # Sample log line from the RL bot
 test_lines = [
     "2025-08-25 03:16:47,566 - INFO - 📊 ENHANCED DECISION:",
@@ -17,56 +33,48 @@ test_lines = [
     "2025-08-25 03:16:47,567 - INFO - 🎯 Signal: ⚪ HOLD (Strength: 0)"
 ]
 
+def parse_log_timestamp(s):
+    """Parse a fixed-width 'YYYY-MM-DD HH:MM:SS' string without strptime"""
+    return datetime(int(s[0:4]), int(s[5:7]), int(s[8:10]),
+                    int(s[11:13]), int(s[14:16]), int(s[17:19]))
+
 print("Testing RL log parsing...")
 
+NOW = datetime.now()
+CUTOFF = NOW - timedelta(minutes=60)
+
 for line in test_lines:
     print(f"\nTesting: {line}")
     
     # Test timestamp extraction
-    timestamp_match = re.match(r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})', line)
+    timestamp_match = TIMESTAMP_RE.match(line)
     if timestamp_match:
         timestamp_str = timestamp_match.group(1)
         print(f"  Timestamp: {timestamp_str}")
         
         try:
-            log_time = datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S')
-            time_diff = datetime.now() - log_time
-            print(f"  Time diff: {time_diff} (within 60 min: {time_diff < timedelta(minutes=60)})")
+            log_time = parse_log_timestamp(timestamp_str)
+            time_diff = NOW - log_time
+            print(f"  Time diff: {time_diff} (within 60 min: {log_time > CUTOFF})")
         except Exception as e:
             print(f"  Time parsing error: {e}")
     
+    # Dispatch on the first character of the message body so at most one
+    # pattern is tried per line
+    message = line.partition(' - INFO - ')[2].lstrip()
+    lead = message[:1]
+    
     # Test RL Enhanced Decision
-    if '📊 ENHANCED DECISION:' in line:
+    if lead == '📊' and message.startswith('📊 ENHANCED DECISION:'):
         print("  ✓ RL Enhanced Decision detected")
     
-    # Test original signal
-    if 'Original: Signal=' in line and 'Strength=' in line:
-        match = re.search(r'Original: Signal=([^,]+), Strength=(\d+)', line)
-        if match:
-            print(f"  ✓ Original signal: {match.group(1)}, strength: {match.group(2)}")
-        else:
-            print("  ✗ Original signal pattern failed")
-    
-    # Test RL action
-    if 'RL: Action=' in line and 'Confidence=' in line:
-        match = re.search(r'RL: Action=([^,]+), Confidence=([^%]+)', line)
-        if match:
-            print(f"  ✓ RL action: {match.group(1)}, confidence: {match.group(2)}")
-        else:
-            print("  ✗ RL action pattern failed")
-    
-    # Test market data
-    if '💹' in line and 'RSI:' in line and 'VWAP:' in line:
-        market_match = re.search(r'💹 ([^:]+): \$([^|]+) \| RSI: ([^|]+) \| VWAP: \$([^$]+)', line)
-        if market_match:
-            print(f"  ✓ Market data: {market_match.group(1)} @ ${market_match.group(2)}, RSI: {market_match.group(3)}, VWAP: ${market_match.group(4)}")
-        else:
-            print("  ✗ Market data pattern failed")
-    
-    # Test signal info
-    if '🎯 Signal:' in line:
-        signal_match = re.search(r'🎯 Signal: [⚪🟢🔴] (\w+) \(Strength: (\d+)\)', line)
-        if signal_match:
-            print(f"  ✓ Signal: {signal_match.group(1)}, strength: {signal_match.group(2)}")
-        else:
-            print("  ✗ Signal pattern failed")
\ No newline at end of file
+    # Test original signal, RL action, market data and signal info
+    check = LINE_DISPATCH.get(lead)
+    if check:
+        needle, pattern, found_fmt, failed_msg = check
+        if needle in message:
+            match = pattern.search(message)
+            if match:
+                print(f"  ✓ {found_fmt.format(*match.groups())}")
+            else:
+                print(f"  ✗ {failed_msg}")
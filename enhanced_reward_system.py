@@ -16,16 +16,18 @@ Features:
 - Time-based reward decay for position holding
 """
 
+import math
 import numpy as np
-import pandas as pd
+from collections import deque
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(slots=True)
 class TradeMetrics:
     """Container for individual trade metrics"""
     pnl_pct: float
@@ -39,7 +41,7 @@ class TradeMetrics:
     volume_at_entry: float = 0.0
     volatility_at_entry: float = 0.0
 
-@dataclass
+@dataclass(slots=True)
 class PortfolioMetrics:
     """Container for portfolio-level metrics"""
     total_return: float
@@ -56,6 +58,155 @@ class PortfolioMetrics:
     recent_volatility: float
     risk_free_rate: float = 0.02  # 2% annual risk-free rate
 
+# Placeholder trade passed to the kernel for non-closing actions
+_NO_TRADE = TradeMetrics(
+    pnl_pct=0.0, pnl_amount=0.0, entry_price=0.0, exit_price=0.0, position_type='',
+    duration_minutes=0, max_adverse_excursion=0.0, max_favorable_excursion=0.0
+)
+
+# Integer action codes for the reward kernel
+ACTION_BUY = 0
+ACTION_SELL = 1
+ACTION_CLOSE = 2
+ACTION_HOLD = 3
+ACTION_CODES = {'BUY': ACTION_BUY, 'SELL': ACTION_SELL, 'CLOSE': ACTION_CLOSE, 'HOLD': ACTION_HOLD}
+
+# Scalar reward kernels. Module-level functions over plain floats/ints so the
+# per-step reward is one call without instance attribute or dict lookups.
+
+def _base_pnl_reward(pnl_pct, base_reward_multiplier, base_penalty_multiplier):
+    """Asymmetric PnL reward: profits and losses use different multipliers"""
+    if pnl_pct > 0:
+        return pnl_pct * base_reward_multiplier
+    return pnl_pct * base_penalty_multiplier
+
+def _risk_adjustment(pnl_pct, max_adverse_excursion, max_favorable_excursion, volatility_at_entry):
+    """Risk-adjusted reward component"""
+    # Reward trades that perform well relative to market volatility
+    if volatility_at_entry > 0:
+        risk_bonus = (pnl_pct / volatility_at_entry) * 5.0
+    else:
+        risk_bonus = 0.0
+        
+    # Bonus for favorable risk/reward ratio
+    if max_favorable_excursion > 0 and max_adverse_excursion < 0:
+        risk_reward_ratio = max_favorable_excursion / abs(max_adverse_excursion)
+        if risk_reward_ratio > 2.0:  # At least 2:1 risk/reward achieved
+            risk_bonus += 0.1 * min(risk_reward_ratio, 5.0)  # Cap bonus
+            
+    return risk_bonus
+
+def _duration_factor(pnl_pct, duration_minutes):
+    """Duration-based reward factor: encourage quick profits, penalize holding losers"""
+    if pnl_pct > 0:
+        # Bonus for quick wins (within 1 hour)
+        if duration_minutes <= 60:
+            return 1.2
+        # Slight penalty for very long winners (opportunity cost)
+        elif duration_minutes > 240:  # 4 hours
+            return 0.9
+        return 1.0
+    # Penalty increases with duration for losing trades
+    hours_held = duration_minutes / 60.0
+    return max(0.5, 1.0 - (hours_held * 0.1))  # -10% per hour, min 50%
+
+def _trade_reward(pnl_pct, max_adverse_excursion, max_favorable_excursion, duration_minutes,
+                  volatility_at_entry, base_reward_multiplier, base_penalty_multiplier):
+    """Base reward for a completed trade"""
+    base_reward = _base_pnl_reward(pnl_pct, base_reward_multiplier, base_penalty_multiplier)
+    risk_adjustment = _risk_adjustment(pnl_pct, max_adverse_excursion, max_favorable_excursion,
+                                       volatility_at_entry)
+    mae_penalty = min(0.0, max_adverse_excursion * 10)  # Penalize large drawdowns
+    duration_factor = _duration_factor(pnl_pct, duration_minutes)
+    return (base_reward + risk_adjustment + mae_penalty) * duration_factor
+
+def _hold_reward(duration_minutes, rsi):
+    """Reward for holding a position"""
+    # Base holding cost (encourages action)
+    base_cost = -0.0001
+    
+    # Time decay penalty (increases with duration). ``**`` is kept over
+    # math.pow: CPython specializes the float power operator, which measured
+    # faster than the math.pow call.
+    time_penalty = -0.001 * (duration_minutes / 60.0) ** 1.2  # Exponential increase
+    
+    # Market condition penalty (holding in adverse conditions)
+    market_penalty = 0.0
+    if rsi > 80 or rsi < 20:  # Extreme RSI - action likely needed
+        market_penalty = -0.0005
+        
+    return base_cost + time_penalty + market_penalty
+
+def _entry_reward(action_code, rsi):
+    """Reward for entry actions: transaction cost with opportunity bonus"""
+    base_cost = -0.001
+    
+    opportunity_bonus = 0.0
+    if action_code == ACTION_BUY and rsi < 35:  # Buying oversold
+        opportunity_bonus = 0.0005
+    elif action_code == ACTION_SELL and rsi > 65:  # Selling overbought
+        opportunity_bonus = 0.0005
+        
+    return base_cost + opportunity_bonus
+
+def _streak_factor(consecutive_wins, consecutive_losses, streak_bonus_cap):
+    """Streak-based reward multiplier"""
+    if consecutive_wins > 0:
+        # Bonus for winning streaks (compound growth simulation)
+        return min(streak_bonus_cap, 1.0 + (consecutive_wins * 0.15))
+    elif consecutive_losses > 0:
+        # Penalty for losing streaks (prevent blowups)
+        return max(0.4, 1.0 - (consecutive_losses * 0.1))
+    return 1.0
+
+def _drawdown_penalty(current_drawdown, drawdown_penalty_multiplier):
+    """Penalty based on current drawdown"""
+    if current_drawdown > 0.05:  # >5% drawdown
+        return -current_drawdown * drawdown_penalty_multiplier
+    return 0.0
+
+def _portfolio_heat_penalty(recent_volatility, total_return):
+    """Penalty for excessive portfolio risk (recent volatility vs returns)"""
+    if recent_volatility > 0.05 and total_return < recent_volatility:  # Poor risk-adjusted performance
+        return -0.005
+    return 0.0
+
+@lru_cache(maxsize=None)
+def make_reward_kernel(base_reward_multiplier, base_penalty_multiplier):
+    """
+    Build the per-step reward kernel with the reward multipliers baked in
+    
+    The multipliers are bound as closure constants rather than passed (or
+    looked up on the instance) on every step; the calculator rebuilds its
+    kernel whenever a multiplier is assigned. Kernels are cached per
+    parameter set.
+    """
+    def reward_kernel(action_code, has_trade, pnl_pct, max_adverse_excursion, max_favorable_excursion,
+                      duration_minutes, volatility_at_entry, position_duration, rsi,
+                      streak_factor, drawdown_penalty, heat_penalty, sharpe_bonus):
+        """Complete enhanced reward for one step as a single call
+        
+        The portfolio-level terms only change when a trade closes, so callers
+        pass them in precomputed.
+        """
+        base_reward = 0.0
+        if has_trade:
+            base_reward = _trade_reward(pnl_pct, max_adverse_excursion, max_favorable_excursion,
+                                        duration_minutes, volatility_at_entry,
+                                        base_reward_multiplier, base_penalty_multiplier)
+        elif action_code == ACTION_HOLD:
+            base_reward = _hold_reward(position_duration, rsi)
+        elif action_code == ACTION_BUY or action_code == ACTION_SELL:
+            base_reward = _entry_reward(action_code, rsi)
+        
+        enhanced_reward = base_reward * streak_factor
+        enhanced_reward += drawdown_penalty
+        enhanced_reward += heat_penalty
+        enhanced_reward += sharpe_bonus
+        return enhanced_reward
+    
+    return reward_kernel
+
 class EnhancedRewardCalculator:
     """
     Advanced reward calculation system for RL trading
@@ -70,7 +221,6 @@ class EnhancedRewardCalculator:
     """
     
     def __init__(self):
-        self.trade_history: List[TradeMetrics] = []
         self.portfolio_metrics = PortfolioMetrics(
             total_return=0.0, win_rate=0.0, profit_factor=1.0, 
             sharpe_ratio=0.0, max_drawdown=0.0, current_drawdown=0.0,
@@ -79,54 +229,213 @@ class EnhancedRewardCalculator:
         )
         
         # Reward system parameters
-        self.base_reward_multiplier = 50.0
-        self.base_penalty_multiplier = 75.0  # Asymmetric - penalize losses more
-        self.streak_bonus_cap = 2.5
-        self.drawdown_penalty_multiplier = 3.0
+        self._base_reward_multiplier = 50.0
+        self._base_penalty_multiplier = 75.0  # Asymmetric - penalize losses more
+        self._streak_bonus_cap = 2.5
+        self._drawdown_penalty_multiplier = 3.0
         self.volatility_adjustment_factor = 1.5
         self.time_decay_factor = 0.95  # Per hour holding penalty
         
+        # Per-step reward kernel specialized on the multipliers above
+        self._rebuild_kernel()
+        
+        self._recent_returns = deque(maxlen=10)  # Returns of the last 10 trades
+        self._reset_accumulators()
+        self._refresh_enhancements()
+        
+    @property
+    def base_reward_multiplier(self) -> float:
+        """Reward multiplier for profitable trades"""
+        return self._base_reward_multiplier
+    
+    @base_reward_multiplier.setter
+    def base_reward_multiplier(self, value: float):
+        self._base_reward_multiplier = value
+        self._rebuild_kernel()
+    
+    @property
+    def base_penalty_multiplier(self) -> float:
+        """Penalty multiplier for losing trades"""
+        return self._base_penalty_multiplier
+    
+    @base_penalty_multiplier.setter
+    def base_penalty_multiplier(self, value: float):
+        self._base_penalty_multiplier = value
+        self._rebuild_kernel()
+    
+    @property
+    def streak_bonus_cap(self) -> float:
+        """Maximum streak multiplier applied to rewards"""
+        return self._streak_bonus_cap
+    
+    @streak_bonus_cap.setter
+    def streak_bonus_cap(self, value: float):
+        self._streak_bonus_cap = value
+        self._refresh_enhancements()
+    
+    @property
+    def drawdown_penalty_multiplier(self) -> float:
+        """Penalty per unit of current drawdown"""
+        return self._drawdown_penalty_multiplier
+    
+    @drawdown_penalty_multiplier.setter
+    def drawdown_penalty_multiplier(self, value: float):
+        self._drawdown_penalty_multiplier = value
+        self._refresh_enhancements()
+    
+    def _rebuild_kernel(self):
+        """Re-specialize the reward kernel so it matches the current multipliers"""
+        self._kernel = make_reward_kernel(self._base_reward_multiplier, self._base_penalty_multiplier)
+    
     def calculate_enhanced_reward(
         self, 
         trade_metrics: Optional[TradeMetrics] = None,
         action: str = "HOLD",
         current_position_duration: int = 0,
-        market_indicators: Dict = None
+        market_indicators: Dict = None,
+        rsi: Optional[float] = None
     ) -> float:
         """
         Calculate enhanced reward based on multiple factors
         
+        The whole calculation runs in the fused reward kernel. When debug
+        logging is enabled the per-component methods are used instead so each
+        reward term can be logged.
+        
         Args:
             trade_metrics: Metrics for completed trade (None for HOLD/entry actions)
             action: Current action taken (BUY, SELL, CLOSE, HOLD)
             current_position_duration: Minutes holding current position
-            market_indicators: Current market state for context
+            market_indicators: Current market state for context (only 'rsi' is used)
+            rsi: Current RSI; takes precedence over market_indicators['rsi'] so
+                callers can skip building the indicators dict
         
         Returns:
             Enhanced reward value
         """
-        if market_indicators is None:
-            market_indicators = {}
-            
+        if rsi is None:
+            rsi = market_indicators.get('rsi', 50) if market_indicators else 50
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            return self._calculate_enhanced_reward_verbose(
+                trade_metrics, action, current_position_duration, rsi)
+        
+        if trade_metrics:
+            # Trade completed - record it before applying portfolio-level enhancements
+            self._record_trade(trade_metrics)
+            self._update_portfolio_metrics()
+            trade = trade_metrics
+        else:
+            trade = _NO_TRADE
+        
+        return self._kernel(
+            ACTION_CODES.get(action, -1), trade_metrics is not None,
+            trade.pnl_pct, trade.max_adverse_excursion, trade.max_favorable_excursion,
+            trade.duration_minutes, trade.volatility_at_entry, current_position_duration, rsi,
+            self._cached_streak_factor, self._cached_dd_penalty,
+            self._cached_heat_penalty, self._cached_sharpe_bonus
+        )
+    
+    def calculate_enhanced_rewards_batch(
+        self,
+        pnl_pct: np.ndarray,
+        max_adverse_excursion: np.ndarray,
+        max_favorable_excursion: np.ndarray,
+        duration_minutes: np.ndarray,
+        volatility_at_entry: np.ndarray,
+        action_codes: np.ndarray,
+        rsi: np.ndarray
+    ) -> np.ndarray:
+        """
+        Vectorized reward calculation for a batch of transitions (e.g. replay buffer samples)
+        
+        Applies the same reward rules as calculate_enhanced_reward element-wise.
+        CLOSE rows are scored as completed trades, HOLD rows use duration_minutes
+        as the current holding time, and BUY/SELL rows as entries. Portfolio-level
+        enhancements use the current portfolio state; trades in the batch are not
+        recorded into the history.
+        
+        Args:
+            pnl_pct: Trade return per row (used by CLOSE rows)
+            max_adverse_excursion: Worst unrealized return during each trade
+            max_favorable_excursion: Best unrealized return during each trade
+            duration_minutes: Trade duration (CLOSE) or holding time (HOLD)
+            volatility_at_entry: Market volatility when each trade was opened
+            action_codes: Integer action per row (see ACTION_CODES)
+            rsi: RSI value per row (used by HOLD/BUY/SELL rows)
+        
+        Returns:
+            Array of enhanced rewards, one per row
+        """
+        pnl = np.asarray(pnl_pct, dtype=float)
+        mae = np.asarray(max_adverse_excursion, dtype=float)
+        mfe = np.asarray(max_favorable_excursion, dtype=float)
+        duration = np.asarray(duration_minutes, dtype=float)
+        vol = np.asarray(volatility_at_entry, dtype=float)
+        codes = np.asarray(action_codes)
+        rsi = np.asarray(rsi, dtype=float)
+        
+        # Completed trades: base PnL, risk adjustment, MAE penalty, duration factor.
+        # Conditional terms are written as mask arithmetic so each is one fused expression.
+        profitable = pnl > 0
+        multiplier_gap = self.base_reward_multiplier - self.base_penalty_multiplier
+        base_reward = pnl * (self.base_penalty_multiplier + profitable * multiplier_gap)
+        
+        risk_adjustment = np.divide(pnl, vol, out=np.zeros_like(pnl), where=vol > 0) * 5.0
+        has_excursions = (mfe > 0) & (mae < 0)
+        risk_reward_ratio = np.divide(mfe, np.abs(mae), out=np.zeros_like(mfe), where=has_excursions)
+        risk_adjustment += (risk_reward_ratio > 2.0) * (0.1 * np.minimum(risk_reward_ratio, 5.0))
+        
+        mae_penalty = np.minimum(0.0, mae * 10)
+        duration_factor = np.select(
+            [profitable & (duration <= 60), profitable & (duration > 240), profitable],
+            [1.2, 0.9, 1.0],
+            default=np.maximum(0.5, 1.0 - (duration / 60.0 * 0.1))
+        )
+        trade_reward = (base_reward + risk_adjustment + mae_penalty) * duration_factor
+        
+        # Holding and entry rewards
+        extreme_rsi = (rsi > 80) | (rsi < 20)
+        hold_reward = -0.0001 - 0.001 * (duration / 60.0) ** 1.2 + extreme_rsi * -0.0005
+        good_entry = ((codes == ACTION_BUY) & (rsi < 35)) | ((codes == ACTION_SELL) & (rsi > 65))
+        entry_reward = -0.001 + good_entry * 0.0005
+        
+        rewards = np.select(
+            [codes == ACTION_CLOSE, codes == ACTION_HOLD, (codes == ACTION_BUY) | (codes == ACTION_SELL)],
+            [trade_reward, hold_reward, entry_reward],
+            default=0.0
+        )
+        
+        # Portfolio-level enhancements are scalars for the whole batch
+        rewards = rewards * self._cached_streak_factor
+        rewards += self._cached_dd_penalty
+        rewards += self._cached_heat_penalty
+        rewards += self._cached_sharpe_bonus
+        return rewards
+    
+    def _calculate_enhanced_reward_verbose(self, trade_metrics: Optional[TradeMetrics], action: str,
+                                           current_position_duration: int, rsi: float) -> float:
+        """Component-by-component reward calculation with debug logging"""
+        
         # Base reward calculation
         base_reward = 0.0
         
         if trade_metrics:
             # Trade completed - calculate comprehensive reward
             base_reward = self._calculate_trade_reward(trade_metrics)
-            self.trade_history.append(trade_metrics)
+            self._record_trade(trade_metrics)
             self._update_portfolio_metrics()
             
         elif action == "HOLD":
             # Holding position - apply time decay and risk penalties
-            base_reward = self._calculate_hold_reward(current_position_duration, market_indicators)
+            base_reward = self._calculate_hold_reward(current_position_duration, rsi)
             
         elif action in ["BUY", "SELL"]:
             # Entry action - small transaction cost with opportunity bonus
-            base_reward = self._calculate_entry_reward(action, market_indicators)
+            base_reward = self._calculate_entry_reward(action, rsi)
             
         # Apply additional reward components
-        enhanced_reward = self._apply_reward_enhancements(base_reward, action, market_indicators)
+        enhanced_reward = self._apply_reward_enhancements(base_reward, action)
         
         return enhanced_reward
     
@@ -134,232 +443,211 @@ class EnhancedRewardCalculator:
         """Calculate base reward for completed trade"""
         
         # Base PnL reward
-        if trade.pnl_pct > 0:
-            base_reward = trade.pnl_pct * self.base_reward_multiplier
-        else:
-            base_reward = trade.pnl_pct * self.base_penalty_multiplier
+        base_reward = _base_pnl_reward(trade.pnl_pct, self.base_reward_multiplier,
+                                       self.base_penalty_multiplier)
             
         # Risk-adjusted component (reward efficiency)
         risk_adjustment = self._calculate_risk_adjustment(trade)
         
         # Maximum Adverse Excursion penalty (reward risk management)
-        mae_penalty = min(0, trade.max_adverse_excursion * 10)  # Penalize large drawdowns
+        mae_penalty = min(0.0, trade.max_adverse_excursion * 10)  # Penalize large drawdowns
         
         # Duration efficiency bonus/penalty
         duration_factor = self._calculate_duration_factor(trade)
         
         total_reward = (base_reward + risk_adjustment + mae_penalty) * duration_factor
         
-        logger.debug(f"Trade reward components: base={base_reward:.4f}, risk_adj={risk_adjustment:.4f}, "
-                    f"mae_penalty={mae_penalty:.4f}, duration_factor={duration_factor:.4f}")
+        logger.debug("Trade reward components: base=%.4f, risk_adj=%.4f, mae_penalty=%.4f, duration_factor=%.4f",
+                     base_reward, risk_adjustment, mae_penalty, duration_factor)
                     
         return total_reward
     
     def _calculate_risk_adjustment(self, trade: TradeMetrics) -> float:
         """Calculate risk-adjusted reward component"""
-        
-        # Reward trades that perform well relative to market volatility
-        if trade.volatility_at_entry > 0:
-            volatility_adjusted_return = trade.pnl_pct / trade.volatility_at_entry
-            risk_bonus = volatility_adjusted_return * 5.0
-        else:
-            risk_bonus = 0.0
-            
-        # Bonus for favorable risk/reward ratio
-        if trade.max_favorable_excursion > 0 and trade.max_adverse_excursion < 0:
-            risk_reward_ratio = trade.max_favorable_excursion / abs(trade.max_adverse_excursion)
-            if risk_reward_ratio > 2.0:  # At least 2:1 risk/reward achieved
-                risk_bonus += 0.1 * min(risk_reward_ratio, 5.0)  # Cap bonus
-                
-        return risk_bonus
+        return _risk_adjustment(trade.pnl_pct, trade.max_adverse_excursion,
+                                trade.max_favorable_excursion, trade.volatility_at_entry)
     
     def _calculate_duration_factor(self, trade: TradeMetrics) -> float:
         """Calculate duration-based reward factor"""
-        
-        # Encourage quick profits, penalize holding losers
-        if trade.pnl_pct > 0:
-            # Bonus for quick wins (within 1 hour)
-            if trade.duration_minutes <= 60:
-                return 1.2
-            # Slight penalty for very long winners (opportunity cost)
-            elif trade.duration_minutes > 240:  # 4 hours
-                return 0.9
-            else:
-                return 1.0
-        else:
-            # Penalty increases with duration for losing trades
-            hours_held = trade.duration_minutes / 60.0
-            return max(0.5, 1.0 - (hours_held * 0.1))  # -10% per hour, min 50%
+        return _duration_factor(trade.pnl_pct, trade.duration_minutes)
     
-    def _calculate_hold_reward(self, duration_minutes: int, market_indicators: Dict) -> float:
+    def _calculate_hold_reward(self, duration_minutes: int, rsi: float) -> float:
         """Calculate reward for holding position"""
-        
-        # Base holding cost (encourages action)
-        base_cost = -0.0001
-        
-        # Time decay penalty (increases with duration)  
-        hours_held = duration_minutes / 60.0
-        time_penalty = -0.001 * (hours_held ** 1.2)  # Exponential increase
-        
-        # Market condition penalty (holding in adverse conditions)
-        market_penalty = 0.0
-        rsi = market_indicators.get('rsi', 50)
-        if rsi > 80 or rsi < 20:  # Extreme RSI - action likely needed
-            market_penalty = -0.0005
-            
-        return base_cost + time_penalty + market_penalty
+        return _hold_reward(duration_minutes, rsi)
     
-    def _calculate_entry_reward(self, action: str, market_indicators: Dict) -> float:
+    def _calculate_entry_reward(self, action: str, rsi: float) -> float:
         """Calculate reward for entry actions"""
-        
-        # Base transaction cost
-        base_cost = -0.001
-        
-        # Opportunity bonus for entering in good conditions
-        opportunity_bonus = 0.0
-        rsi = market_indicators.get('rsi', 50)
-        
-        if action == "BUY" and rsi < 35:  # Buying oversold
-            opportunity_bonus = 0.0005
-        elif action == "SELL" and rsi > 65:  # Selling overbought  
-            opportunity_bonus = 0.0005
-            
-        return base_cost + opportunity_bonus
+        return _entry_reward(ACTION_CODES.get(action, -1), rsi)
     
-    def _apply_reward_enhancements(self, base_reward: float, action: str, market_indicators: Dict) -> float:
+    def _apply_reward_enhancements(self, base_reward: float, action: str) -> float:
         """Apply additional reward enhancements based on portfolio state"""
         
         enhanced_reward = base_reward
         
         # Streak bonuses/penalties
-        streak_factor = self._calculate_streak_factor()
+        streak_factor = self._cached_streak_factor
         enhanced_reward *= streak_factor
         
         # Drawdown penalty
-        drawdown_penalty = self._calculate_drawdown_penalty()
+        drawdown_penalty = self._cached_dd_penalty
         enhanced_reward += drawdown_penalty
         
         # Portfolio heat penalty (risk management)
-        heat_penalty = self._calculate_portfolio_heat_penalty()
+        heat_penalty = self._cached_heat_penalty
         enhanced_reward += heat_penalty
         
         # Sharpe ratio bonus (reward consistent performance)
-        sharpe_bonus = self.portfolio_metrics.sharpe_ratio * 0.01
+        sharpe_bonus = self._cached_sharpe_bonus
         enhanced_reward += sharpe_bonus
         
-        logger.debug(f"Reward enhancements: streak_factor={streak_factor:.3f}, "
-                    f"drawdown_penalty={drawdown_penalty:.4f}, heat_penalty={heat_penalty:.4f}, "
-                    f"sharpe_bonus={sharpe_bonus:.4f}")
+        logger.debug("Reward enhancements: streak_factor=%.3f, drawdown_penalty=%.4f, heat_penalty=%.4f, "
+                     "sharpe_bonus=%.4f", streak_factor, drawdown_penalty, heat_penalty, sharpe_bonus)
         
         return enhanced_reward
     
     def _calculate_streak_factor(self) -> float:
         """Calculate streak-based reward multiplier"""
-        
-        if self.portfolio_metrics.consecutive_wins > 0:
-            # Bonus for winning streaks (compound growth simulation)
-            streak_bonus = min(self.streak_bonus_cap, 
-                             1.0 + (self.portfolio_metrics.consecutive_wins * 0.15))
-            return streak_bonus
-            
-        elif self.portfolio_metrics.consecutive_losses > 0:
-            # Penalty for losing streaks (prevent blowups)
-            streak_penalty = max(0.4, 
-                               1.0 - (self.portfolio_metrics.consecutive_losses * 0.1))
-            return streak_penalty
-            
-        return 1.0
+        return _streak_factor(self.portfolio_metrics.consecutive_wins,
+                              self.portfolio_metrics.consecutive_losses, self.streak_bonus_cap)
     
     def _calculate_drawdown_penalty(self) -> float:
         """Calculate penalty based on current drawdown"""
-        
-        if self.portfolio_metrics.current_drawdown > 0.05:  # >5% drawdown
-            penalty = -self.portfolio_metrics.current_drawdown * self.drawdown_penalty_multiplier
-            return penalty
-        return 0.0
+        return _drawdown_penalty(self.portfolio_metrics.current_drawdown, self.drawdown_penalty_multiplier)
     
     def _calculate_portfolio_heat_penalty(self) -> float:
         """Calculate penalty for excessive portfolio risk"""
+        return _portfolio_heat_penalty(self.portfolio_metrics.recent_volatility,
+                                       self.portfolio_metrics.total_return)
+    
+    def _refresh_enhancements(self):
+        """Cache the portfolio-level reward terms; they only change when a trade closes"""
+        self._cached_streak_factor = self._calculate_streak_factor()
+        self._cached_dd_penalty = self._calculate_drawdown_penalty()
+        self._cached_heat_penalty = self._calculate_portfolio_heat_penalty()
+        self._cached_sharpe_bonus = self.portfolio_metrics.sharpe_ratio * 0.01
+    
+    def _record_trade(self, trade: TradeMetrics):
+        """Record a completed trade
         
-        # Simple risk measure - recent volatility vs returns
-        if self.portfolio_metrics.recent_volatility > 0.05:  # >5% volatility
-            if self.portfolio_metrics.total_return < self.portfolio_metrics.recent_volatility:
-                # Poor risk-adjusted performance
-                return -0.005
-        return 0.0
+        Trades only matter through the running accumulators, so just the
+        latest return is kept for _update_portfolio_metrics to fold in.
+        """
+        n = self._n_trades
+        pnl = float(trade.pnl_pct)
+        self._last_return = pnl
+        self._n_trades = n + 1
+        
+        # Track where the current run of same-signed returns started;
+        # break-even trades always start a new (empty) run
+        sign = (pnl > 0) - (pnl < 0)
+        if sign != self._last_sign or sign == 0:
+            self._last_sign = sign
+            self._last_sign_change = n
+    
+    def _reset_accumulators(self):
+        """Reset running portfolio statistics"""
+        self._n_trades = 0
+        self._last_return = 0.0  # Return of the most recently recorded trade
+        self._last_sign = 0  # Sign of the latest trade's return
+        self._last_sign_change = 0  # Index of the first trade in the current streak
+        self._n_wins = 0
+        self._n_losses = 0
+        self._sum_wins = 0.0
+        self._sum_losses = 0.0
+        self._mean_return = 0.0  # Welford running mean of all returns
+        self._m2_return = 0.0  # Welford running sum of squared deviations
+        self._log_cum = 0.0  # Sum of log1p(return): log of the compounded growth factor
+        self._max_log_cum = -math.inf  # Highest log growth so far (set by first trade)
+        self._recent_returns.clear()
     
     def _update_portfolio_metrics(self):
-        """Update portfolio-level metrics after new trade"""
+        """Update portfolio-level metrics after new trade
         
-        if not self.trade_history:
+        Folds the latest trade into running accumulators, so each update is
+        O(1) no matter how many trades have been recorded.
+        """
+        
+        n = self._n_trades
+        if n == 0:
             return
-            
-        # Calculate basic metrics
-        returns = [trade.pnl_pct for trade in self.trade_history]
-        winning_trades = [r for r in returns if r > 0]
-        losing_trades = [r for r in returns if r < 0]
         
-        self.portfolio_metrics.total_trades = len(self.trade_history)
-        self.portfolio_metrics.win_rate = len(winning_trades) / len(returns) if returns else 0
+        r = self._last_return
+        pm = self.portfolio_metrics
         
-        if winning_trades:
-            self.portfolio_metrics.avg_win_pct = np.mean(winning_trades)
-        if losing_trades:
-            self.portfolio_metrics.avg_loss_pct = np.mean(losing_trades)
+        # Calculate basic metrics
+        if r > 0:
+            self._n_wins += 1
+            self._sum_wins += r
+        elif r < 0:
+            self._n_losses += 1
+            self._sum_losses += r
+        
+        pm.total_trades = n
+        pm.win_rate = self._n_wins / n
+        
+        if self._n_wins:
+            pm.avg_win_pct = self._sum_wins / self._n_wins
+        if self._n_losses:
+            pm.avg_loss_pct = self._sum_losses / self._n_losses
             
         # Profit factor
-        gross_profit = sum(winning_trades) if winning_trades else 0
-        gross_loss = abs(sum(losing_trades)) if losing_trades else 1  # Avoid division by zero
-        self.portfolio_metrics.profit_factor = gross_profit / gross_loss
-        
-        # Total return (compound)
-        self.portfolio_metrics.total_return = np.prod([1 + r for r in returns]) - 1
-        
-        # Sharpe ratio (simplified)
-        if len(returns) > 1:
-            excess_return = np.mean(returns) - (self.portfolio_metrics.risk_free_rate / 252)
-            volatility = np.std(returns)
-            self.portfolio_metrics.sharpe_ratio = excess_return / volatility if volatility > 0 else 0
+        gross_loss = abs(self._sum_losses) if self._n_losses else 1  # Avoid division by zero
+        pm.profit_factor = self._sum_wins / gross_loss
+        
+        # Total return (compound), accumulated in log space to avoid overflow/underflow
+        # over long histories. A loss of 100% or more wipes out the growth factor.
+        self._log_cum += math.log1p(r) if r > -1 else -math.inf
+        pm.total_return = math.expm1(self._log_cum)
+        
+        # Sharpe ratio (simplified) from Welford's running mean/variance
+        delta = r - self._mean_return
+        self._mean_return += delta / n
+        self._m2_return += delta * (r - self._mean_return)
+        if n > 1:
+            excess_return = self._mean_return - (pm.risk_free_rate / 252)
+            volatility = math.sqrt(self._m2_return / n)
+            pm.sharpe_ratio = excess_return / volatility if volatility > 0 else 0
             
-        # Drawdown calculations
-        cumulative_returns = np.cumprod([1 + r for r in returns])
-        running_max = np.maximum.accumulate(cumulative_returns)
-        drawdown = (cumulative_returns - running_max) / running_max
-        
-        self.portfolio_metrics.max_drawdown = abs(np.min(drawdown)) if len(drawdown) > 0 else 0
-        self.portfolio_metrics.current_drawdown = abs(drawdown[-1]) if len(drawdown) > 0 else 0
+        # Drawdown calculations: 1 - growth / peak growth, computed from the log difference
+        self._max_log_cum = max(self._max_log_cum, self._log_cum)
+        if self._log_cum > -math.inf:
+            pm.current_drawdown = abs(math.expm1(self._log_cum - self._max_log_cum))
+        else:
+            pm.current_drawdown = 1.0
+        pm.max_drawdown = max(pm.max_drawdown, pm.current_drawdown)
         
         # Streak calculations
         self._update_streaks()
         
         # Recent volatility (last 10 trades)
-        recent_returns = returns[-10:] if len(returns) >= 10 else returns
-        self.portfolio_metrics.recent_volatility = np.std(recent_returns) if len(recent_returns) > 1 else 0.02
+        self._recent_returns.append(r)
+        k = len(self._recent_returns)
+        if k > 1:
+            recent_mean = sum(self._recent_returns) / k
+            recent_var = sum((x - recent_mean) ** 2 for x in self._recent_returns) / k
+            pm.recent_volatility = math.sqrt(recent_var)
+        else:
+            pm.recent_volatility = 0.02
+        
+        self._refresh_enhancements()
     
     def _update_streaks(self):
-        """Update consecutive wins/losses streaks"""
+        """Update consecutive wins/losses streaks
+        
+        The streak is the number of trades since the sign of the return last
+        changed, tracked by _record_trade, so this is O(1). Break-even trades
+        reset streaks.
+        """
         
-        if not self.trade_history:
+        n = self._n_trades
+        if n == 0:
             return
-            
-        # Count from the end
-        consecutive_wins = 0
-        consecutive_losses = 0
-        
-        for trade in reversed(self.trade_history):
-            if trade.pnl_pct > 0:
-                if consecutive_losses > 0:
-                    break
-                consecutive_wins += 1
-            elif trade.pnl_pct < 0:
-                if consecutive_wins > 0:
-                    break
-                consecutive_losses += 1
-            else:  # Break even trades reset streaks
-                break
-                
-        self.portfolio_metrics.consecutive_wins = consecutive_wins
-        self.portfolio_metrics.consecutive_losses = consecutive_losses
+        
+        last = self._last_sign
+        streak = n - self._last_sign_change if last != 0 else 0
+        
+        self.portfolio_metrics.consecutive_wins = streak if last > 0 else 0
+        self.portfolio_metrics.consecutive_losses = streak if last < 0 else 0
     
     def get_reward_breakdown(self) -> Dict:
         """Get detailed breakdown of last reward calculation for debugging"""
@@ -374,7 +662,7 @@ class EnhancedRewardCalculator:
                 'consecutive_losses': self.portfolio_metrics.consecutive_losses,
                 'profit_factor': self.portfolio_metrics.profit_factor
             },
-            'recent_trades': len(self.trade_history),
+            'recent_trades': self._n_trades,
             'parameters': {
                 'base_reward_multiplier': self.base_reward_multiplier,
                 'base_penalty_multiplier': self.base_penalty_multiplier,
@@ -384,10 +672,23 @@ class EnhancedRewardCalculator:
 
     def reset_metrics(self):
         """Reset all metrics for new training episode"""
-        self.trade_history.clear()
-        self.portfolio_metrics = PortfolioMetrics(
-            total_return=0.0, win_rate=0.0, profit_factor=1.0, 
-            sharpe_ratio=0.0, max_drawdown=0.0, current_drawdown=0.0,
-            consecutive_wins=0, consecutive_losses=0, total_trades=0,
-            avg_win_pct=0.0, avg_loss_pct=0.0, recent_volatility=0.02
-        )
\ No newline at end of file
+        self._reset_accumulators()
+        self._zero_portfolio_metrics()
+        self._refresh_enhancements()
+    
+    def _zero_portfolio_metrics(self):
+        """Restore portfolio metrics to their initial values in place"""
+        pm = self.portfolio_metrics
+        pm.total_return = 0.0
+        pm.win_rate = 0.0
+        pm.profit_factor = 1.0
+        pm.sharpe_ratio = 0.0
+        pm.max_drawdown = 0.0
+        pm.current_drawdown = 0.0
+        pm.consecutive_wins = 0
+        pm.consecutive_losses = 0
+        pm.total_trades = 0
+        pm.avg_win_pct = 0.0
+        pm.avg_loss_pct = 0.0
+        pm.recent_volatility = 0.02
+        pm.risk_free_rate = 0.02
\ No newline at end of file
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Exchange Info Cache
+Per-symbol Binance futures exchange info shared by the trading bots
+"""
+
+import time
+from typing import Dict, Optional
+
+# Binance can change a symbol's filters (step size, tick size, min notional)
+# while a bot runs, so cached entries are refetched after this many seconds
+SYMBOL_INFO_TTL = 3600
+
+# Order rejections caused by symbol filters: filter failure (LOT_SIZE,
+# PRICE_FILTER, ...), precision over maximum, notional below minimum
+FILTER_ERROR_CODES = (-1013, -1111, -4164)
+
+class SymbolInfoCache:
+    """futures_exchange_info entry for one symbol, cached for SYMBOL_INFO_TTL
+
+    The full exchange info payload covers every symbol, so sizing and order
+    rounding read this cached entry instead of downloading it on every call.
+    """
+
+    def __init__(self, client, symbol: str, ttl: float = SYMBOL_INFO_TTL):
+        self.client = client
+        self.symbol = symbol
+        self.ttl = ttl
+        self._info = None
+        self._fetched_at = 0.0
+
+    def get(self) -> Optional[Dict]:
+        """Get the symbol's exchange info entry, refetching it once the TTL expires
+
+        Returns:
+            The symbol entry (quoteAsset, filters, ...), or None if Binance did
+            not list the symbol; a missing symbol is looked up again next call
+        """
+        if self._info is None or time.monotonic() - self._fetched_at >= self.ttl:
+            exchange_info = self.client.futures_exchange_info()
+            self._info = next(
+                (s for s in exchange_info['symbols'] if s['symbol'] == self.symbol), None
+            )
+            self._fetched_at = time.monotonic()
+        return self._info
+
+    def invalidate(self):
+        """Drop the cached entry so the next get() refetches it"""
+        self._info = None
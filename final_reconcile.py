@@ -8,6 +8,7 @@ import os
 from binance.client import Client
 from dotenv import load_dotenv
 from database import get_database
+from reconcile_utils import compute_trade_pnls, fetch_position
 import logging
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -25,20 +26,9 @@ def final_reconciliation():
     
     try:
         # Get current Binance position
-        positions = client.futures_position_information(symbol=symbol)
-        current_position = None
-        
-        for pos in positions:
-            if pos['symbol'] == symbol:
-                position_amt = float(pos['positionAmt'])
-                if abs(position_amt) > 0.001:
-                    current_position = {
-                        'amount': position_amt,
-                        'entry_price': float(pos['entryPrice']),
-                        'side': 'SELL' if position_amt < 0 else 'BUY',
-                        'quantity': abs(position_amt)
-                    }
-                break
+        current_position = fetch_position(client, symbol)
+        if current_position and abs(current_position.amount) <= 0.001:
+            current_position = None
         
         # Get current price
         ticker = client.get_symbol_ticker(symbol=symbol)
@@ -49,46 +39,35 @@ def final_reconciliation():
         logger.info(f"Current Price: ${current_price:.4f}")
         
         # Get all open trades from database
-        open_trades = db.get_open_trades(symbol)
+        open_trades = db.get_open_trades_arrays(symbol)
         logger.info(f"Database Open Trades: {len(open_trades)}")
         
         if current_position:
             # Strategy: Close all old trades and create new one matching Binance
             logger.info("📊 Closing all database trades and creating new matching trade...")
             
-            total_closed_pnl = 0
-            closed_count = 0
+            # Close all existing trades in a single batch
+            pnls, pnl_percentages = compute_trade_pnls(open_trades, current_price)
+            pnls = pnls.tolist()
+            db.bulk_update_trade_exits([
+                (current_price, pnl, pnl_percentage, 'CLOSED', trade_id)
+                for trade_id, pnl, pnl_percentage in zip(open_trades['id'].tolist(), pnls, pnl_percentages.tolist())
+            ])
+            
+            total_closed_pnl = sum(pnls)
+            closed_count = len(open_trades)
             
-            # Close all existing trades
-            for trade in open_trades:
-                # Calculate PnL
-                if trade['side'] == 'BUY':
-                    pnl = (current_price - trade['entry_price']) * trade['quantity']
-                else:  # SELL
-                    pnl = (trade['entry_price'] - current_price) * trade['quantity']
-                
-                pnl_percentage = (pnl / (trade['entry_price'] * trade['quantity'])) * 100
-                
-                db.update_trade_exit(
-                    trade_id=trade['id'],
-                    exit_price=current_price,
-                    pnl=pnl,
-                    pnl_percentage=pnl_percentage,
-                    status='CLOSED'
-                )
-                
-                total_closed_pnl += pnl
-                closed_count += 1
-                
-                logger.info(f"✅ Closed Trade {trade['id']}: {trade['side']} {trade['quantity']} @ ${trade['entry_price']:.4f}, PnL: ${pnl:.2f}")
+            for (trade_id, side, quantity, entry_price), pnl in zip(open_trades.tolist(), pnls):
+                logger.info("✅ Closed Trade %s: %s %s @ $%.4f, PnL: $%.2f",
+                            trade_id, side, quantity, entry_price, pnl)
             
             # Create new trade matching current Binance position
             trade_id = db.store_trade(
                 signal_id=0,  # No signal ID for reconciliation
                 symbol=symbol,
-                side=current_position['side'],
-                quantity=current_position['quantity'],
-                entry_price=current_position['entry_price'],
+                side=current_position.side,
+                quantity=current_position.quantity,
+                entry_price=current_position.entry_price,
                 leverage=50,  # Assuming 50x leverage
                 position_percentage=51,  # Assuming 51% position size
                 order_id=f"RECONCILE_{int(current_price * 10000)}",
@@ -96,52 +75,37 @@ def final_reconciliation():
             )
             
             logger.info(f"🆕 Created new trade matching Binance: ID={trade_id}")
-            logger.info(f"   {current_position['side']} {current_position['quantity']} @ ${current_position['entry_price']:.4f}")
+            logger.info(f"   {current_position.side} {current_position.quantity} @ ${current_position.entry_price:.4f}")
             logger.info(f"💰 Total PnL from closed trades: ${total_closed_pnl:.2f}")
             
         else:
             # No position on Binance - close all trades
             logger.info("🔄 No position on Binance - closing all database trades")
             
-            for trade in open_trades:
-                if trade['side'] == 'BUY':
-                    pnl = (current_price - trade['entry_price']) * trade['quantity']
-                else:  # SELL
-                    pnl = (trade['entry_price'] - current_price) * trade['quantity']
-                
-                pnl_percentage = (pnl / (trade['entry_price'] * trade['quantity'])) * 100
-                
-                db.update_trade_exit(
-                    trade_id=trade['id'],
-                    exit_price=current_price,
-                    pnl=pnl,
-                    pnl_percentage=pnl_percentage,
-                    status='CLOSED'
-                )
-                
-                logger.info(f"✅ Closed Trade {trade['id']}: {trade['side']} {trade['quantity']} @ ${trade['entry_price']:.4f}, PnL: ${pnl:.2f}")
+            pnls, pnl_percentages = compute_trade_pnls(open_trades, current_price)
+            pnls = pnls.tolist()
+            db.bulk_update_trade_exits([
+                (current_price, pnl, pnl_percentage, 'CLOSED', trade_id)
+                for trade_id, pnl, pnl_percentage in zip(open_trades['id'].tolist(), pnls, pnl_percentages.tolist())
+            ])
+            
+            for (trade_id, side, quantity, entry_price), pnl in zip(open_trades.tolist(), pnls):
+                logger.info("✅ Closed Trade %s: %s %s @ $%.4f, PnL: $%.2f",
+                            trade_id, side, quantity, entry_price, pnl)
         
         # Final verification
-        final_open_trades = db.get_open_trades(symbol)
-        db_position = 0
-        for trade in final_open_trades:
-            if trade['side'] == 'BUY':
-                db_position += trade['quantity']
-            else:
-                db_position -= trade['quantity']
-        
-        binance_position = current_position['amount'] if current_position else 0
+        summary = db.get_position_summary(symbol)
+        db_position, open_total = summary['OPEN']
+        closed_total = summary['CLOSED'][1]
         
-        with db.get_connection() as conn:
-            cursor = conn.execute("SELECT COUNT(*) as count FROM trades WHERE status = 'CLOSED'")
-            closed_total = cursor.fetchone()['count']
+        binance_position = current_position.amount if current_position else 0
         
         logger.info(f"🎉 Reconciliation Complete!")
         logger.info(f"   Binance Position: {binance_position}")
         logger.info(f"   Database Position: {db_position}")
         logger.info(f"   Match: {abs(binance_position - db_position) < 0.001}")
         logger.info(f"   Total Closed Trades: {closed_total}")
-        logger.info(f"   Open Trades: {len(final_open_trades)}")
+        logger.info(f"   Open Trades: {open_total}")
         
     except Exception as e:
         logger.error(f"❌ Error in final reconciliation: {e}")
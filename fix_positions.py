@@ -9,6 +9,7 @@ from binance.client import Client
 from binance.exceptions import BinanceAPIException
 from dotenv import load_dotenv
 from database import get_database
+from reconcile_utils import compute_trade_pnls, fetch_position, net_position
 import logging
 
 # Configure logging
@@ -38,24 +39,14 @@ def fix_positions():
         logger.info("🔄 Starting advanced position reconciliation...")
         
         # Get live position from Binance
-        positions = client.futures_position_information(symbol=symbol)
-        live_position_amt = 0
+        live_position = fetch_position(client, symbol)
+        live_position_amt = live_position.amount if live_position else 0
         
-        for pos in positions:
-            if pos['symbol'] == symbol:
-                live_position_amt = float(pos['positionAmt'])
-                break
-        
-        # Get open trades from database
-        open_trades = db.get_open_trades(symbol)
+        # Get open trades from database, oldest first for FIFO closure
+        open_trades = db.get_open_trades_arrays(symbol, oldest_first=True)
         
         # Calculate database position
-        db_position_amt = 0
-        for trade in open_trades:
-            if trade['side'] == 'BUY':
-                db_position_amt += trade['quantity']
-            else:  # SELL
-                db_position_amt -= trade['quantity']
+        db_position_amt = net_position(open_trades)
         
         logger.info(f"📊 Position Analysis:")
         logger.info(f"   Binance Position: {live_position_amt}")
@@ -72,26 +63,20 @@ def fix_positions():
             # No position on Binance - close all database trades
             logger.info("🔄 No position on Binance - closing all database trades")
             
-            for trade in open_trades:
-                # Calculate PnL
-                if trade['side'] == 'BUY':
-                    pnl = (current_price - trade['entry_price']) * trade['quantity']
-                else:  # SELL
-                    pnl = (trade['entry_price'] - current_price) * trade['quantity']
-                
-                # Calculate PnL percentage
-                pnl_percentage = (pnl / (trade['entry_price'] * trade['quantity'])) * 100
-                
-                # Update trade to closed
-                db.update_trade_exit(
-                    trade_id=trade['id'],
-                    exit_price=current_price,
-                    pnl=pnl,
-                    pnl_percentage=pnl_percentage,
-                    status='CLOSED'
-                )
-                
-                logger.info(f"✅ Closed Trade {trade['id']}: {trade['side']} {trade['quantity']} @ ${trade['entry_price']:.4f} → ${current_price:.4f}, PnL: ${pnl:.2f} ({pnl_percentage:.2f}%)")
+            # Calculate PnL and PnL percentage for every trade at once
+            pnls, pnl_percentages = compute_trade_pnls(open_trades, current_price)
+            closures = list(zip(open_trades.tolist(), pnls.tolist(), pnl_percentages.tolist()))
+            
+            # Update all trades to closed in a single batch
+            db.bulk_update_trade_exits([
+                (current_price, pnl, pnl_percentage, 'CLOSED', trade_id)
+                for (trade_id, _, _, _), pnl, pnl_percentage in closures
+            ])
+            
+            for (trade_id, side, quantity, entry_price), pnl, pnl_percentage in closures:
+                logger.info("✅ Closed Trade %s: %s %s @ $%.4f → $%.4f, PnL: $%.2f (%.2f%%)",
+                            trade_id, side, quantity, entry_price,
+                            current_price, pnl, pnl_percentage)
         
         elif abs(abs(live_position_amt) - abs(db_position_amt)) > 0.001:
             # Partial closure - some trades were closed
@@ -101,61 +86,44 @@ def fix_positions():
             closed_amount = abs(db_position_amt) - abs(live_position_amt)
             logger.info(f"   Estimated closed amount: {closed_amount:.4f}")
             
-            # Strategy: Close older trades first (FIFO)
+            # Strategy: Close older trades first (FIFO); open_trades is already oldest first
             remaining_to_close = closed_amount
-            open_trades.sort(key=lambda x: x['timestamp'])  # Sort by timestamp (oldest first)
+            pnls, pnl_percentages = compute_trade_pnls(open_trades, current_price)
+            closures = []
             
-            for trade in open_trades:
+            for trade, trade_quantity, pnl, pnl_percentage in zip(open_trades.tolist(), open_trades['quantity'].tolist(),
+                                                                 pnls.tolist(), pnl_percentages.tolist()):
                 if remaining_to_close <= 0.001:
                     break
                 
-                trade_quantity = trade['quantity']
-                
                 if trade_quantity <= remaining_to_close:
                     # Close entire trade
-                    if trade['side'] == 'BUY':
-                        pnl = (current_price - trade['entry_price']) * trade_quantity
-                    else:  # SELL
-                        pnl = (trade['entry_price'] - current_price) * trade_quantity
-                    
-                    pnl_percentage = (pnl / (trade['entry_price'] * trade_quantity)) * 100
-                    
-                    db.update_trade_exit(
-                        trade_id=trade['id'],
-                        exit_price=current_price,
-                        pnl=pnl,
-                        pnl_percentage=pnl_percentage,
-                        status='CLOSED'
-                    )
-                    
+                    closures.append((trade, pnl, pnl_percentage))
                     remaining_to_close -= trade_quantity
-                    logger.info(f"✅ Closed Trade {trade['id']}: {trade['side']} {trade_quantity} @ ${trade['entry_price']:.4f} → ${current_price:.4f}, PnL: ${pnl:.2f}")
                     
                 # Note: For partial trade closure within a single trade, you'd need more complex logic
                 # For now, we're using FIFO (First In, First Out) approach
+            
+            db.bulk_update_trade_exits([
+                (current_price, pnl, pnl_percentage, 'CLOSED', trade_id)
+                for (trade_id, _, _, _), pnl, pnl_percentage in closures
+            ])
+            
+            for (trade_id, side, quantity, entry_price), pnl, pnl_percentage in closures:
+                logger.info("✅ Closed Trade %s: %s %s @ $%.4f → $%.4f, PnL: $%.2f",
+                            trade_id, side, quantity, entry_price,
+                            current_price, pnl)
         
         else:
             logger.info("✅ Positions already match - no reconciliation needed")
         
-        # Show final stats
-        with db.get_connection() as conn:
-            cursor = conn.execute("SELECT COUNT(*) as count FROM trades WHERE status = 'OPEN'")
-            open_count = cursor.fetchone()['count']
-            
-            cursor = conn.execute("SELECT COUNT(*) as count FROM trades WHERE status = 'CLOSED'")
-            closed_count = cursor.fetchone()['count']
+        # Show final stats and verify reconciliation from a single summary query
+        summary = db.get_position_summary(symbol)
+        db_position_after, open_count = summary['OPEN']
+        closed_count = summary['CLOSED'][1]
         
         logger.info(f"📈 Final status: {open_count} open trades, {closed_count} closed trades")
         
-        # Verify reconciliation
-        open_trades_after = db.get_open_trades(symbol)
-        db_position_after = 0
-        for trade in open_trades_after:
-            if trade['side'] == 'BUY':
-                db_position_after += trade['quantity']
-            else:  # SELL
-                db_position_after -= trade['quantity']
-        
         logger.info(f"📊 After reconciliation:")
         logger.info(f"   Binance Position: {live_position_amt}")
         logger.info(f"   Database Position: {db_position_after}")
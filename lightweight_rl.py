@@ -299,6 +299,7 @@ class TradingSimulator:
         
         current_price = self.data[self.current_idx].get('price', 3.7)
         current_indicators = self.get_current_indicators()
+        current_rsi = current_indicators.get('rsi', 50)
         reward = 0
         
         # Calculate position duration
@@ -330,7 +331,7 @@ class TradingSimulator:
                     trade_metrics=None,
                     action=action,
                     current_position_duration=0,
-                    market_indicators=current_indicators
+                    rsi=current_rsi
                 )
             else:
                 reward = -0.001  # Small transaction cost
@@ -347,7 +348,7 @@ class TradingSimulator:
                     trade_metrics=None,
                     action=action,
                     current_position_duration=0,
-                    market_indicators=current_indicators
+                    rsi=current_rsi
                 )
             else:
                 reward = -0.001
@@ -382,7 +383,7 @@ class TradingSimulator:
                     trade_metrics=trade_metrics,
                     action=action,
                     current_position_duration=position_duration_minutes,
-                    market_indicators=current_indicators
+                    rsi=current_rsi
                 )
             else:
                 # Traditional reward system
@@ -416,7 +417,7 @@ class TradingSimulator:
                     trade_metrics=None,
                     action=action,
                     current_position_duration=position_duration_minutes,
-                    market_indicators=current_indicators
+                    rsi=current_rsi
                 )
             else:
                 # Traditional hold penalty
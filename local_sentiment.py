@@ -7,8 +7,44 @@ Uses keyword-based scoring and simple NLP techniques to analyze market sentiment
 from news headlines without external API calls.
 """
 
+import functools
 import re
-from typing import List, Dict
+from typing import List, Dict, Tuple
+
+import numpy as np
+
+# Word tokenizer, compiled once for every analyze_sentiment call
+_WORD_RE = re.compile(r'\b[a-zA-Z]+\b')
+
+# Distinct headline lists remembered per analyzer
+_CACHE_SIZE = 4096
+
+# Explanation text depends only on the label, whether the label's own score
+# is strong (> 2) and whether volatility is high (> 1), so every variant is
+# built once here. Key: (label or None for neutral, strong, volatile).
+_LABEL_PHRASES = {
+    'Bullish': ("Positive market sentiment from news", "Strong bullish indicators in headlines"),
+    'Bearish': ("Negative market sentiment from news", "Strong bearish indicators in headlines"),
+    None: ("Mixed or neutral market sentiment", None),
+}
+
+def _build_explanations() -> Dict:
+    explanations = {}
+    for label, (phrase, strong_phrase) in _LABEL_PHRASES.items():
+        for strong in ((False, True) if strong_phrase else (False,)):
+            for volatile in (False, True):
+                parts = [phrase]
+                if strong:
+                    parts.append(strong_phrase)
+                if volatile:
+                    parts.append("High volatility expected")
+                explanations[label, strong, volatile] = ". ".join(parts) + "."
+    return explanations
+
+_EXPLANATIONS = _build_explanations()
+
+# analyze_batch label codes index this tuple
+_BATCH_LABELS = ('Bullish', 'Bearish', 'Neutral')
 
 class LocalSentimentAnalyzer:
     """
@@ -39,11 +75,28 @@ class LocalSentimentAnalyzer:
             'volatile': 2, 'volatility': 2, 'swing': 1, 'turbulent': 2,
             'uncertainty': 1, 'unstable': 1, 'whipsaw': 2
         }
+        
+        # Single lookup table: word -> (category, weight), with categories
+        # 0=bullish, 1=bearish, 2=volatility. Filled lowest priority first so
+        # a word listed twice keeps the category the old if/elif chain picked.
+        self._keywords = {}
+        for category, keywords in ((2, self.volatility_keywords),
+                                   (1, self.bearish_keywords),
+                                   (0, self.bullish_keywords)):
+            for word, weight in keywords.items():
+                self._keywords[word] = (category, weight)
+        
+        # Feeds are re-scored every polling tick, usually with unchanged
+        # headlines. Wrapped per instance so the cache goes away with the analyzer.
+        self._score_cached = functools.lru_cache(maxsize=_CACHE_SIZE)(self._score_titles)
     
     def analyze_sentiment(self, news_titles: List[str]) -> Dict:
         """
         Analyze sentiment from news titles using keyword scoring
         
+        Results are memoized on the headline tuple, so re-scoring an
+        unchanged feed skips tokenizing and scoring.
+        
         Args:
             news_titles: List of news headlines
             
@@ -57,26 +110,45 @@ class LocalSentimentAnalyzer:
                 'explanation': 'No titles provided'
             }
         
+        sentiment, confidence, explanation, bullish, bearish, volatility, net = (
+            self._score_cached(tuple(title.strip() for title in news_titles))
+        )
+        
+        # Fresh dict per call so callers can't modify the cached result
+        return {
+            'sentiment': sentiment,
+            'confidence': confidence,
+            'explanation': explanation,
+            'scores': {
+                'bullish': bullish,
+                'bearish': bearish,
+                'volatility': volatility,
+                'net': net
+            }
+        }
+    
+    def clear_cache(self):
+        """Forget memoized analyze_sentiment results"""
+        self._score_cached.cache_clear()
+    
+    def _score_titles(self, news_titles: Tuple[str, ...]) -> Tuple:
+        """Score a non-empty headline tuple; backs the analyze_sentiment cache"""
         # Combine all titles into one text
         text = ' '.join(news_titles).lower()
         
         # Remove punctuation and split into words
-        words = re.findall(r'\b[a-zA-Z]+\b', text)
-        
-        # Calculate sentiment scores
-        bullish_score = 0
-        bearish_score = 0
-        volatility_score = 0
+        words = _WORD_RE.findall(text)
         
-        total_words = len(words)
+        # Calculate sentiment scores (bullish, bearish, volatility)
+        scores = [0, 0, 0]
+        keywords = self._keywords
         
         for word in words:
-            if word in self.bullish_keywords:
-                bullish_score += self.bullish_keywords[word]
-            elif word in self.bearish_keywords:
-                bearish_score += self.bearish_keywords[word]
-            elif word in self.volatility_keywords:
-                volatility_score += self.volatility_keywords[word]
+            entry = keywords.get(word)
+            if entry is not None:
+                scores[entry[0]] += entry[1]
+        
+        bullish_score, bearish_score, volatility_score = scores
         
         # Normalize scores by number of titles
         num_titles = len(news_titles)
@@ -103,39 +175,98 @@ class LocalSentimentAnalyzer:
             bullish_score, bearish_score, volatility_score, sentiment
         )
         
-        return {
-            'sentiment': sentiment,
-            'confidence': confidence,
-            'explanation': explanation,
-            'scores': {
-                'bullish': round(bullish_score, 2),
-                'bearish': round(bearish_score, 2),
-                'volatility': round(volatility_score, 2),
-                'net': round(net_score, 2)
-            }
-        }
+        return (
+            sentiment,
+            confidence,
+            explanation,
+            round(bullish_score, 2),
+            round(bearish_score, 2),
+            round(volatility_score, 2),
+            round(net_score, 2)
+        )
+    
+    def analyze_batch(self, title_lists: List[List[str]]) -> List[Dict]:
+        """
+        Analyze sentiment for many headline lists at once
+        
+        Keyword hits from every list are tallied in one pass and the
+        per-list normalization, labels and confidences are computed as
+        array operations. Each result matches analyze_sentiment(titles).
+        
+        Args:
+            title_lists: One list of news headlines per document
+            
+        Returns:
+            List[Dict]: Sentiment analysis results aligned with title_lists
+        """
+        n_docs = len(title_lists)
+        hit_slots = []
+        hit_weights = []
+        
+        keywords = self._keywords
+        
+        for doc, news_titles in enumerate(title_lists):
+            for word in _WORD_RE.findall(' '.join(news_titles).lower()):
+                entry = keywords.get(word)
+                if entry is not None:
+                    hit_slots.append(doc * 3 + entry[0])
+                    hit_weights.append(entry[1])
+        
+        # (bullish, bearish, volatility) totals per document, normalized by number of titles
+        totals = np.bincount(
+            np.asarray(hit_slots, dtype=np.intp),
+            weights=np.asarray(hit_weights, dtype=np.float64),
+            minlength=3 * n_docs
+        ).reshape(n_docs, 3)
+        num_titles = np.fromiter((len(t) for t in title_lists), dtype=np.float64, count=n_docs)
+        scores = totals / np.maximum(num_titles, 1)[:, None]
+        
+        bullish, bearish, volatility = scores[:, 0], scores[:, 1], scores[:, 2]
+        net = bullish - bearish
+        label_codes = np.where(net > 1.0, 0, np.where(net < -1.0, 1, 2)).tolist()
+        # Clip before truncating so huge scores can't overflow the integer cast
+        confidences = np.clip((bullish + bearish) * 2, 0, 10).astype(np.int8).tolist()
+        score_rows = scores.tolist()
+        net_scores = net.tolist()
+        
+        results = []
+        for doc in range(n_docs):
+            if not title_lists[doc]:
+                results.append({
+                    'sentiment': 'Unknown',
+                    'confidence': 0,
+                    'explanation': 'No titles provided'
+                })
+                continue
+            
+            bull, bear, vol = score_rows[doc]
+            net_score = net_scores[doc]
+            sentiment = _BATCH_LABELS[label_codes[doc]]
+            results.append({
+                'sentiment': sentiment,
+                'confidence': confidences[doc],
+                'explanation': self._generate_explanation(bull, bear, vol, sentiment),
+                'scores': {
+                    'bullish': round(bull, 2),
+                    'bearish': round(bear, 2),
+                    'volatility': round(vol, 2),
+                    'net': round(net_score, 2)
+                }
+            })
+        
+        return results
     
     def _generate_explanation(self, bullish: float, bearish: float, 
                             volatility: float, sentiment: str) -> str:
         """Generate explanation based on scores"""
-        
-        explanations = []
-        
         if sentiment == 'Bullish':
-            explanations.append("Positive market sentiment from news")
-            if bullish > 2:
-                explanations.append("Strong bullish indicators in headlines")
+            key = (sentiment, bullish > 2, volatility > 1)
         elif sentiment == 'Bearish':
-            explanations.append("Negative market sentiment from news")
-            if bearish > 2:
-                explanations.append("Strong bearish indicators in headlines")
+            key = (sentiment, bearish > 2, volatility > 1)
         else:
-            explanations.append("Mixed or neutral market sentiment")
-        
-        if volatility > 1:
-            explanations.append("High volatility expected")
+            key = (None, False, volatility > 1)
         
-        return ". ".join(explanations) + "."
+        return _EXPLANATIONS[key]
 
 def test_local_sentiment():
     """Test local sentiment analyzer"""
@@ -20,6 +20,24 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Sentiment fields requested from the model, shared by the single-call and two-call paths
+_SENTIMENT_CRITERIA = """1. Overall Sentiment: Choose ONE - Bullish, Bearish, or Neutral
+2. Sentiment Score: A number from -1.0 (very bearish) to +1.0 (very bullish)
+3. Confidence Level: 0-100 (how confident are you in this analysis)
+4. Individual Scores:
+   - Bullish count (number of bullish items)
+   - Bearish count (number of bearish items)
+   - Neutral count (number of neutral items)
+5. Explanation: 2-3 sentences explaining the sentiment"""
+
+_SENTIMENT_JSON_FIELDS = '''    "sentiment": "Bullish|Bearish|Neutral",
+    "sentiment_score": <-1.0 to 1.0>,
+    "confidence": <0-100>,
+    "bullish_count": <number>,
+    "bearish_count": <number>,
+    "neutral_count": <number>,
+    "explanation": "<your explanation>"'''
+
 
 class OpenAINewsSentiment:
     """
@@ -58,20 +76,7 @@ class OpenAINewsSentiment:
             today = datetime.now().strftime("%Y-%m-%d")
 
             # Create prompt to get latest SUI news
-            prompt = f"""You are a crypto news aggregator and market analyst. Generate {count} realistic and plausible news updates about SUI cryptocurrency based on current crypto market patterns and SUI's ecosystem development.
-
-For each news item, provide:
-1. A concise headline (1 line)
-2. Brief summary (1-2 sentences)
-
-Focus on realistic scenarios including:
-- Typical price movements (ranging from -15% to +20% daily changes)
-- Common DeFi partnerships and integrations
-- Realistic technical developments (scaling, new features)
-- Standard trading volume patterns
-- Developer activity and ecosystem updates
-- Market sentiment shifts
-- Correlation with major cryptos (BTC, ETH)
+            prompt = self._news_brief(count) + """
 
 Format each news item as:
 [HEADLINE]: <headline>
@@ -102,6 +107,24 @@ Generate realistic market scenarios that could be happening today. Make them var
             # Return fallback news
             return self._get_fallback_news()
 
+    @staticmethod
+    def _news_brief(count: int) -> str:
+        """Instructions for generating `count` SUI news items, without output format"""
+        return f"""You are a crypto news aggregator and market analyst. Generate {count} realistic and plausible news updates about SUI cryptocurrency based on current crypto market patterns and SUI's ecosystem development.
+
+For each news item, provide:
+1. A concise headline (1 line)
+2. Brief summary (1-2 sentences)
+
+Focus on realistic scenarios including:
+- Typical price movements (ranging from -15% to +20% daily changes)
+- Common DeFi partnerships and integrations
+- Realistic technical developments (scaling, new features)
+- Standard trading volume patterns
+- Developer activity and ecosystem updates
+- Market sentiment shifts
+- Correlation with major cryptos (BTC, ETH)"""
+
     def _parse_news_response(self, response_text: str) -> List[str]:
         """
         Parse the OpenAI response to extract news items
@@ -203,24 +226,11 @@ Generate realistic market scenarios that could be happening today. Make them var
 
 Provide a comprehensive sentiment analysis with:
 
-1. Overall Sentiment: Choose ONE - Bullish, Bearish, or Neutral
-2. Sentiment Score: A number from -1.0 (very bearish) to +1.0 (very bullish)
-3. Confidence Level: 0-100 (how confident are you in this analysis)
-4. Individual Scores:
-   - Bullish count (number of bullish items)
-   - Bearish count (number of bearish items)
-   - Neutral count (number of neutral items)
-5. Explanation: 2-3 sentences explaining the sentiment
+{_SENTIMENT_CRITERIA}
 
 Format your response as JSON:
 {{
-    "sentiment": "Bullish|Bearish|Neutral",
-    "sentiment_score": <-1.0 to 1.0>,
-    "confidence": <0-100>,
-    "bullish_count": <number>,
-    "bearish_count": <number>,
-    "neutral_count": <number>,
-    "explanation": "<your explanation>"
+{_SENTIMENT_JSON_FIELDS}
 }}"""
 
             # Call OpenAI API
@@ -238,25 +248,7 @@ Format your response as JSON:
             # Parse response
             sentiment_data = json.loads(response.choices[0].message.content)
 
-            # Validate and format response
-            result = {
-                'sentiment': sentiment_data.get('sentiment', 'Neutral'),
-                'sentiment_score': float(sentiment_data.get('sentiment_score', 0.0)),
-                'confidence': int(sentiment_data.get('confidence', 50)),
-                'explanation': sentiment_data.get('explanation', 'Analysis completed'),
-                'article_count': len(news_items),
-                'scores': {
-                    'bullish': sentiment_data.get('bullish_count', 0),
-                    'bearish': sentiment_data.get('bearish_count', 0),
-                    'neutral': sentiment_data.get('neutral_count', 0)
-                },
-                'timestamp': datetime.utcnow().isoformat(),
-                'headlines': news_items[:5]  # Store top 5 headlines
-            }
-
-            logger.info(f"✅ Sentiment Analysis: {result['sentiment']} (score: {result['sentiment_score']:.2f}, confidence: {result['confidence']}%)")
-
-            return result
+            return self._build_sentiment_result(sentiment_data, news_items)
 
         except Exception as e:
             logger.error(f"❌ Error analyzing sentiment: {e}")
@@ -272,6 +264,86 @@ Format your response as JSON:
                 'headlines': news_items[:5]
             }
 
+    def _build_sentiment_result(self, sentiment_data: Dict, news_items: List[str]) -> Dict:
+        """Validate the model's sentiment JSON and format it as an analysis result"""
+        result = {
+            'sentiment': sentiment_data.get('sentiment', 'Neutral'),
+            'sentiment_score': float(sentiment_data.get('sentiment_score', 0.0)),
+            'confidence': int(sentiment_data.get('confidence', 50)),
+            'explanation': sentiment_data.get('explanation', 'Analysis completed'),
+            'article_count': len(news_items),
+            'scores': {
+                'bullish': sentiment_data.get('bullish_count', 0),
+                'bearish': sentiment_data.get('bearish_count', 0),
+                'neutral': sentiment_data.get('neutral_count', 0)
+            },
+            'timestamp': datetime.utcnow().isoformat(),
+            'headlines': news_items[:5]  # Store top 5 headlines
+        }
+
+        logger.info(f"✅ Sentiment Analysis: {result['sentiment']} (score: {result['sentiment_score']:.2f}, confidence: {result['confidence']}%)")
+
+        return result
+
+    def fetch_and_analyze(self, count: int = 20) -> Dict:
+        """
+        Generate news and analyze its sentiment with a single OpenAI call
+
+        One JSON-mode completion returns both the news items and the
+        sentiment fields, saving a full round-trip compared with
+        fetch_sui_news followed by analyze_sentiment. If the combined call
+        fails or yields no news, falls back to those two calls.
+
+        Args:
+            count: Number of news items to generate
+
+        Returns:
+            Dict with sentiment analysis results (same shape as analyze_sentiment)
+        """
+        try:
+            logger.info(f"📰 Fetching {count} SUI news updates with sentiment in one request...")
+
+            prompt = self._news_brief(count) + f"""
+
+Make them varied - mix of positive, negative, and neutral news to reflect real market conditions.
+
+Then analyze the overall market sentiment for SUI cryptocurrency based on the news items you generated, with:
+
+{_SENTIMENT_CRITERIA}
+
+Format your response as JSON:
+{{
+    "news": [{{"headline": "<headline>", "summary": "<summary>"}}],
+{_SENTIMENT_JSON_FIELDS}
+}}"""
+
+            response = self.client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[
+                    {"role": "system", "content": "You are a cryptocurrency news expert and market sentiment analyst. Provide realistic crypto news and accurate, unbiased sentiment analysis of it."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.7,  # News generation needs variety; the analysis is of that same text
+                max_tokens=2500,  # Budget of both previous calls
+                response_format={"type": "json_object"}
+            )
+
+            data = json.loads(response.choices[0].message.content)
+            news_items = [
+                f"{item['headline'].strip()}: {item['summary'].strip()}"
+                for item in data.get('news', [])
+                if item.get('headline') and item.get('summary')
+            ]
+            if not news_items:
+                raise ValueError("No news items in combined response")
+
+            logger.info(f"✅ Fetched {len(news_items)} news items")
+            return self._build_sentiment_result(data, news_items)
+
+        except Exception as e:
+            logger.warning(f"⚠️ Combined news/sentiment request failed ({e}), using separate requests")
+            return self.analyze_sentiment(self.fetch_sui_news(count))
+
     def get_news_and_sentiment(self, count: int = 20) -> Dict:
         """
         Fetch news and analyze sentiment in one call
@@ -282,13 +354,7 @@ Format your response as JSON:
         Returns:
             Dict with news and sentiment analysis
         """
-        # Fetch news
-        news_items = self.fetch_sui_news(count)
-
-        # Analyze sentiment
-        sentiment_result = self.analyze_sentiment(news_items)
-
-        return sentiment_result
+        return self.fetch_and_analyze(count)
 
 
 def test_openai_news_sentiment():
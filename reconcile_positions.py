@@ -9,6 +9,7 @@ from binance.client import Client
 from binance.exceptions import BinanceAPIException
 from dotenv import load_dotenv
 from database import get_database
+from reconcile_utils import compute_trade_pnls, fetch_position, net_position
 import logging
 
 # Configure logging
@@ -47,16 +48,11 @@ def reconcile_all_positions():
         for symbol in symbols:
             try:
                 # Get live position from Binance
-                positions = client.futures_position_information(symbol=symbol)
-                live_position_amt = 0
-                
-                for pos in positions:
-                    if pos['symbol'] == symbol:
-                        live_position_amt = float(pos['positionAmt'])
-                        break
+                live_position = fetch_position(client, symbol)
+                live_position_amt = live_position.amount if live_position else 0
                 
                 # Get open trades from database
-                open_trades = db.get_open_trades(symbol)
+                open_trades = db.get_open_trades_arrays(symbol)
                 
                 if abs(live_position_amt) < 0.001 and len(open_trades) > 0:
                     # Position closed on Binance but still open in database
@@ -66,38 +62,23 @@ def reconcile_all_positions():
                     ticker = client.get_symbol_ticker(symbol=symbol)
                     current_price = float(ticker['price'])
                     
-                    # Close all open trades in database
-                    for trade in open_trades:
-                        # Calculate PnL
-                        if trade['side'] == 'BUY':
-                            pnl = (current_price - trade['entry_price']) * trade['quantity']
-                        else:  # SELL
-                            pnl = (trade['entry_price'] - current_price) * trade['quantity']
-                        
-                        # Calculate PnL percentage
-                        pnl_percentage = (pnl / (trade['entry_price'] * trade['quantity'])) * 100
-                        
-                        # Update trade to closed
-                        db.update_trade_exit(
-                            trade_id=trade['id'],
-                            exit_price=current_price,
-                            pnl=pnl,
-                            pnl_percentage=pnl_percentage,
-                            status='CLOSED'
-                        )
-                        
-                        total_reconciled += 1
-                        
-                        logger.info(f"✅ Trade {trade['id']}: {trade['side']} {trade['quantity']} @ ${trade['entry_price']:.4f} → ${current_price:.4f}, PnL: ${pnl:.2f} ({pnl_percentage:.2f}%)")
+                    # Close all open trades in database in a single batch
+                    pnls, pnl_percentages = compute_trade_pnls(open_trades, current_price)
+                    closures = list(zip(open_trades.tolist(), pnls.tolist(), pnl_percentages.tolist()))
+                    
+                    total_reconciled += db.bulk_update_trade_exits([
+                        (current_price, pnl, pnl_percentage, 'CLOSED', trade_id)
+                        for (trade_id, _, _, _), pnl, pnl_percentage in closures
+                    ])
+                    
+                    for (trade_id, side, quantity, entry_price), pnl, pnl_percentage in closures:
+                        logger.info("✅ Trade %s: %s %s @ $%.4f → $%.4f, PnL: $%.2f (%.2f%%)",
+                                    trade_id, side, quantity, entry_price,
+                                    current_price, pnl, pnl_percentage)
                 
                 elif len(open_trades) > 0:
                     # Calculate database position
-                    db_position_amt = 0
-                    for trade in open_trades:
-                        if trade['side'] == 'BUY':
-                            db_position_amt += trade['quantity']
-                        else:  # SELL
-                            db_position_amt -= trade['quantity']
+                    db_position_amt = net_position(open_trades)
                     
                     if abs(abs(live_position_amt) - abs(db_position_amt)) > 0.001:
                         logger.warning(f"⚠️ {symbol}: Position mismatch - Binance: {live_position_amt}, Database: {db_position_amt}")
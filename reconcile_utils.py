@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Reconciliation Helpers
+Vectorized PnL math shared by the position reconciliation scripts
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+@dataclass(slots=True)
+class Position:
+    """Live Binance futures position, parsed once from positionAmt/entryPrice"""
+    amount: float
+    entry_price: float
+    side: str
+    quantity: float
+
+def fetch_position(client, symbol: str) -> Optional[Position]:
+    """Get the live Binance futures position for a symbol
+
+    Args:
+        client: Binance client
+        symbol: Trading pair
+
+    Returns:
+        Position (amount is signed, negative for shorts), or None if Binance
+        returned no entry for the symbol
+    """
+    positions = client.futures_position_information(symbol=symbol)
+    pos = next((p for p in positions if p['symbol'] == symbol), None)
+    if pos is None:
+        return None
+    amount = float(pos['positionAmt'])
+    return Position(
+        amount=amount,
+        entry_price=float(pos['entryPrice']),
+        side='SELL' if amount < 0 else 'BUY',
+        quantity=abs(amount)
+    )
+
+def compute_trade_pnls(trades: np.ndarray, current_price: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Mark open trades to the current price in one vectorized pass
+
+    Args:
+        trades: Open trades (as returned by TradingDatabase.get_open_trades_arrays)
+        current_price: Price the trades are closed at
+
+    Returns:
+        Tuple of (pnl, pnl_percentage) arrays aligned with ``trades``
+    """
+    entries = trades['entry_price']
+    quantities = trades['quantity']
+
+    # BUY profits when price rises above entry, SELL when it falls below
+    pnl = np.where(trades['side'] == 'BUY', current_price - entries, entries - current_price) * quantities
+    # Rows with a zero notional (malformed entry price or quantity) get 0%
+    # instead of inf/nan
+    notional = entries * quantities
+    pnl_percentage = np.divide(pnl, notional, out=np.zeros_like(pnl), where=notional != 0) * 100
+    return pnl, pnl_percentage
+
+def net_position(trades: np.ndarray) -> float:
+    """Signed net quantity of open trades (BUY adds, SELL subtracts)
+
+    Args:
+        trades: Open trades (as returned by TradingDatabase.get_open_trades_arrays)
+
+    Returns:
+        Net position amount, comparable to Binance ``positionAmt``
+    """
+    quantities = trades['quantity']
+    return float(np.where(trades['side'] == 'BUY', quantities, -quantities).sum())
@@ -360,12 +360,13 @@ class EnhancedRLRetrainer:
         logger.info("🔍 TRAINING RESULTS ANALYSIS:")
         
         # Calculate averages
-        recent_history = self.agent.training_history[-50:] if len(self.agent.training_history) >= 50 else self.agent.training_history
+        recent_history = self.agent.training_history[-50:]
         
         if recent_history:
-            avg_win_rate = sum(h['win_rate'] for h in recent_history) / len(recent_history)
-            avg_return = sum(h.get('return_pct', 0) for h in recent_history) / len(recent_history)
-            avg_trades = sum(h['total_trades'] for h in recent_history) / len(recent_history)
+            n = len(recent_history)
+            avg_win_rate = np.fromiter((h['win_rate'] for h in recent_history), dtype=np.float64, count=n).mean()
+            avg_return = np.fromiter((h.get('return_pct', 0) for h in recent_history), dtype=np.float64, count=n).mean()
+            avg_trades = np.fromiter((h['total_trades'] for h in recent_history), dtype=np.float64, count=n).mean()
             
             logger.info(f"📊 Recent Performance (last {len(recent_history)} episodes):")
             logger.info(f"   Average win rate: {avg_win_rate:.1f}%")
@@ -376,8 +377,9 @@ class EnhancedRLRetrainer:
         
         # Show learning progress
         if len(self.agent.training_history) >= 20:
-            early_avg = sum(h.get('return_pct', 0) for h in self.agent.training_history[:10]) / 10
-            late_avg = sum(h.get('return_pct', 0) for h in self.agent.training_history[-10:]) / 10
+            returns = np.fromiter((h.get('return_pct', 0) for h in self.agent.training_history), dtype=np.float64)
+            early_avg = returns[:10].mean()
+            late_avg = returns[-10:].mean()
             improvement = late_avg - early_avg
             
             logger.info(f"📈 Learning Progress:")
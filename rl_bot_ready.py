@@ -180,6 +180,13 @@ class TechnicalIndicators:
     This class provides static methods for calculating common technical analysis
     indicators including EMA, RSI, MACD, and VWAP. All methods are stateless
     and work with pandas Series data structures.
+    
+    Indicators are recomputed over the whole kline window on each tick rather
+    than updated one bar at a time. pandas already evaluates rolling means and
+    EWMs as single-pass running recurrences (O(N) per window), and the EMAs
+    (adjust=True) and VWAP are anchored at the start of the window, so their
+    values shift as the window slides and cannot be carried over between ticks
+    without changing the signals.
     """
     
     @staticmethod
@@ -262,8 +269,13 @@ class TechnicalIndicators:
         Returns:
             pd.Series: VWAP values for each period
         """
-        typical_price = (high + low + close) / 3
-        return (typical_price * volume).cumsum() / volume.cumsum()
+        # Computed on the raw arrays: same values as the Series arithmetic
+        # without pandas' per-operation alignment and dispatch
+        typical_price = (high.values + low.values + close.values) / 3
+        volume = volume.values
+        with np.errstate(divide='ignore', invalid='ignore'):
+            vwap = np.cumsum(typical_price * volume) / np.cumsum(volume)
+        return pd.Series(vwap, index=close.index)
 
 class RLEnhancedBinanceFuturesBot:
     """RL-Enhanced Binance Futures Trading Bot
@@ -320,6 +332,16 @@ class RLEnhancedBinanceFuturesBot:
         self.paused = False
         self.pause_file = 'bot_pause.flag'
         
+        # Market data cache - Last kline window per (interval, limit), so each
+        # tick only downloads candles since the last fetch
+        self._klines_cache: Dict[Tuple[str, int], pd.DataFrame] = {}
+        
+        # Position snapshot cache - reconcile_positions and get_position_info run
+        # back to back each tick; share one REST snapshot between them
+        self.position_cache_ttl = 5.0  # seconds
+        self._positions_cache = None
+        self._positions_cache_time = 0.0
+        
         # Database - SQLite connection for storing trades and signals
         self.db = get_database()
         
@@ -386,6 +408,11 @@ Signal Sources:
         Retrieves OHLCV data for the specified symbol and converts it to
         a pandas DataFrame with proper data types and timestamp formatting.
         
+        After the first call the window is updated incrementally: only klines
+        from the last cached candle onward are requested (refreshing the
+        still-open candle) and merged into the cached window. If the gap is
+        too large to cover in one request, the full window is fetched again.
+        
         Args:
             interval: Kline interval (e.g., '1m', '5m', '1h', '1d')
             limit: Number of klines to retrieve (max 1000)
@@ -394,24 +421,33 @@ Signal Sources:
             pd.DataFrame: OHLCV data with timestamp, open, high, low, close, volume
         """
         try:
+            cache_key = (interval, limit)
+            cached = self._klines_cache.get(cache_key)
+            
+            if cached is not None:
+                last_open_ms = cached['timestamp'].iloc[-1].value // 1_000_000
+                klines = self.client.futures_klines(
+                    symbol=self.symbol,
+                    interval=interval,
+                    startTime=last_open_ms,
+                    limit=limit
+                )
+                # A full page means there may be newer candles than we got
+                if 0 < len(klines) < limit:
+                    df = pd.concat([cached.iloc[:-1], self._klines_to_df(klines)], ignore_index=True)
+                    df = df.iloc[-limit:].reset_index(drop=True)
+                    self._klines_cache[cache_key] = df
+                    return df
+            
             klines = self.client.futures_klines(
                 symbol=self.symbol,
                 interval=interval,
                 limit=limit
             )
             
-            df = pd.DataFrame(klines, columns=[
-                'timestamp', 'open', 'high', 'low', 'close', 'volume',
-                'close_time', 'quote_asset_volume', 'number_of_trades',
-                'taker_buy_base_asset_volume', 'taker_buy_quote_asset_volume', 'ignore'
-            ])
-            
-            # Convert to proper types
-            numeric_columns = ['open', 'high', 'low', 'close', 'volume']
-            for col in numeric_columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-            
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+            df = self._klines_to_df(klines)
+            if not df.empty:
+                self._klines_cache[cache_key] = df
             
             return df
             
@@ -419,6 +455,31 @@ Signal Sources:
             logger.error(f"Error fetching kline data: {e}")
             return pd.DataFrame()
     
+    @staticmethod
+    def _klines_to_df(klines: List) -> pd.DataFrame:
+        """Convert raw Binance kline rows to a typed DataFrame
+        
+        Only the open time and OHLCV fields are kept; nothing downstream
+        reads the other six kline fields. The five price/volume columns
+        are parsed from their decimal strings in one 2-D cast.
+        """
+        columns = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+        if not klines:
+            return pd.DataFrame(columns=columns)
+        
+        rows = np.asarray(klines, dtype=object)
+        ohlcv = rows[:, 1:6].astype(np.float64)
+        
+        return pd.DataFrame({
+            # Open times are epoch milliseconds; reinterpret instead of parsing
+            'timestamp': rows[:, 0].astype(np.int64).view('datetime64[ms]'),
+            'open': ohlcv[:, 0],
+            'high': ohlcv[:, 1],
+            'low': ohlcv[:, 2],
+            'close': ohlcv[:, 3],
+            'volume': ohlcv[:, 4]
+        })
+    
     def calculate_indicators(self, df: pd.DataFrame) -> Dict:
         """Calculate all technical indicators for the trading strategy
         
@@ -473,8 +534,12 @@ Signal Sources:
             Dict: Complete signal data including direction, strength, reasons, and enhancement status
         """
 
+        # Latest candle values, read once and shared by every layer below
+        current_price = df['close'].values[-1]
+        latest = self._extract_current_indicators(indicators)
+
         # Get original signal using traditional logic (Layer 1)
-        original_signal_data = self._generate_original_signals(df, indicators)
+        original_signal_data = self._generate_original_signals(current_price, latest, len(df))
 
         # Apply RL enhancement if available (Layer 2)
         rl_signal_data = {'action': 'HOLD', 'confidence': 0.0}
@@ -482,13 +547,13 @@ Signal Sources:
             try:
                 # Prepare indicators for RL
                 indicator_dict = {
-                    'price': df['close'].iloc[-1],
-                    'rsi': indicators['rsi'].iloc[-1],
-                    'macd': indicators['macd'].iloc[-1],
-                    'macd_histogram': indicators['macd_histogram'].iloc[-1],
-                    'vwap': indicators['vwap'].iloc[-1],
-                    'ema_9': indicators['ema_9'].iloc[-1],
-                    'ema_21': indicators['ema_21'].iloc[-1]
+                    'price': current_price,
+                    'rsi': latest['rsi'],
+                    'macd': latest['macd'],
+                    'macd_histogram': latest['macd_histogram'],
+                    'vwap': latest['vwap'],
+                    'ema_9': latest['ema_9'],
+                    'ema_21': latest['ema_21']
                 }
 
                 # Get RL enhancement
@@ -504,8 +569,9 @@ Signal Sources:
                     'reason': enhanced.get('reason', '')
                 }
 
-                logger.info(f"💹 Current SUIUSDC Price: ${df['close'].iloc[-1]:.4f}")
-                logger.info(f"🤖 RL Enhancement: {rl_signal_data['action']} (confidence: {rl_signal_data['confidence']:.1f}%)")
+                logger.info("💹 Current SUIUSDC Price: $%.4f", current_price)
+                logger.info("🤖 RL Enhancement: %s (confidence: %.1f%%)",
+                            rl_signal_data['action'], rl_signal_data['confidence'])
 
             except Exception as e:
                 logger.error(f"❌ RL Enhancement failed: {e}")
@@ -523,7 +589,6 @@ Signal Sources:
                 }
 
                 # Get unified signal from aggregator
-                current_price = df['close'].iloc[-1]
                 unified_result = self.unified_aggregator.aggregate_signals(
                     technical_signal=tech_signal,
                     rl_signal=rl_signal_data,
@@ -531,8 +596,9 @@ Signal Sources:
                     symbol=self.symbol
                 )
 
-                # Log unified signal summary
-                logger.info(self.unified_aggregator.get_signal_summary(unified_result))
+                # Log unified signal summary (built only when it will be emitted)
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(self.unified_aggregator.get_signal_summary(unified_result))
 
                 # Convert unified signal back to bot's format
                 unified_action = unified_result['signal']
@@ -545,7 +611,7 @@ Signal Sources:
                     'reasons': [
                         f"Unified Signal: {unified_action} (strength: {unified_result['strength']:.1f}/10, confidence: {unified_result['confidence']:.1f}%)"
                     ] + original_signal_data.get('reasons', []),
-                    'indicators': self._extract_current_indicators(indicators),
+                    'indicators': latest,
                     'rl_enhanced': RL_ENHANCEMENT_ENABLED,
                     'unified_signal': True,
                     'unified_details': unified_result
@@ -559,7 +625,7 @@ Signal Sources:
                         'signal': enhanced['signal'],
                         'strength': enhanced['strength'],
                         'reasons': [enhanced['reason']] + original_signal_data.get('reasons', []),
-                        'indicators': self._extract_current_indicators(indicators),
+                        'indicators': latest,
                         'rl_enhanced': True
                     }
                 else:
@@ -567,24 +633,19 @@ Signal Sources:
 
         # Fallback to RL or traditional if unified not available
         elif RL_ENHANCEMENT_ENABLED and rl_signal_data['confidence'] > 0:
-            try:
-                enhanced = rl_generator(original_signal_data, indicator_dict)
-                logger.info(f"   Original: Signal={original_signal_data['signal']}, Strength={original_signal_data['strength']}")
-                logger.info(f"   Enhanced: Signal={enhanced['signal']}, Strength={enhanced['strength']}")
-                logger.info(f"   Reason: {enhanced['reason']}")
+            # Reuse the RL result computed above instead of running the generator twice
+            logger.info("   Original: Signal=%s, Strength=%s",
+                        original_signal_data['signal'], original_signal_data['strength'])
+            logger.info("   Enhanced: Signal=%s, Strength=%s", enhanced['signal'], enhanced['strength'])
+            logger.info("   Reason: %s", enhanced['reason'])
 
-                self._current_risk_level = enhanced.get('risk_level', 'LOW')
-
-                signal_data = {
-                    'signal': enhanced['signal'],
-                    'strength': enhanced['strength'],
-                    'reasons': [enhanced['reason']] + original_signal_data.get('reasons', []),
-                    'indicators': self._extract_current_indicators(indicators),
-                    'rl_enhanced': True
-                }
-            except Exception as e:
-                logger.error(f"❌ RL Enhancement failed: {e}")
-                signal_data = original_signal_data
+            signal_data = {
+                'signal': enhanced['signal'],
+                'strength': enhanced['strength'],
+                'reasons': [enhanced['reason']] + original_signal_data.get('reasons', []),
+                'indicators': latest,
+                'rl_enhanced': True
+            }
         else:
             logger.warning("⚠️ Running with traditional signals only")
             signal_data = original_signal_data
@@ -592,14 +653,14 @@ Signal Sources:
         # Store the signal in the database
         signal_id = self.db.store_signal(
             self.symbol,
-            df['close'].iloc[-1],
+            current_price,
             signal_data
         )
         signal_data['signal_id'] = signal_id
 
         return signal_data
     
-    def _generate_original_signals(self, df: pd.DataFrame, indicators: Dict) -> Dict:
+    def _generate_original_signals(self, current_price: float, latest: Dict, candles: int) -> Dict:
         """Original signal generation logic using traditional technical analysis
         
         Analyzes multiple technical indicators to generate buy/sell signals:
@@ -608,9 +669,13 @@ Signal Sources:
         - VWAP: Price position relative to volume-weighted average
         - EMA: Trend analysis using multiple EMA alignments
         
+        Works purely on the latest scalar values, so the caller reads each
+        indicator Series once instead of passing the full window around.
+        
         Args:
-            df: DataFrame containing OHLCV market data
-            indicators: Dictionary of calculated technical indicators
+            current_price: Latest close price
+            latest: Latest value of each indicator (from _extract_current_indicators)
+            candles: Number of candles the indicators were computed over
             
         Returns:
             Dict: Signal data with direction (-1 to 1), strength (0-5), and reasoning
@@ -620,7 +685,7 @@ Signal Sources:
         strength = 0
         reasons = []
         
-        if len(df) < 50:
+        if candles < 50:
             return {
                 'signal': 0,
                 'strength': 0,
@@ -628,11 +693,9 @@ Signal Sources:
                 'indicators': {}
             }
         
-        current_price = df['close'].iloc[-1]
-        
         try:
             # RSI Analysis - Relative Strength Index for overbought/oversold conditions
-            rsi = indicators['rsi'].iloc[-1]
+            rsi = latest['rsi']
             if rsi < 30:
                 signal += 1
                 strength += 2
@@ -645,9 +708,9 @@ Signal Sources:
                 reasons.append(f"RSI neutral ({rsi:.1f})")
             
             # MACD Analysis - Moving Average Convergence Divergence for trend momentum
-            macd = indicators['macd'].iloc[-1]
-            macd_signal = indicators['macd_signal'].iloc[-1]
-            macd_histogram = indicators['macd_histogram'].iloc[-1]
+            macd = latest['macd']
+            macd_signal = latest['macd_signal']
+            macd_histogram = latest['macd_histogram']
             
             if macd > macd_signal and macd_histogram > 0:
                 signal += 1
@@ -659,7 +722,7 @@ Signal Sources:
                 reasons.append("MACD bearish crossover")
             
             # VWAP Analysis - Volume Weighted Average Price for institutional levels
-            vwap = indicators['vwap'].iloc[-1]
+            vwap = latest['vwap']
             if current_price > vwap * 1.001:  # 0.1% above VWAP
                 signal += 1
                 reasons.append(f"Price above VWAP (+{((current_price/vwap-1)*100):.2f}%)")
@@ -668,9 +731,9 @@ Signal Sources:
                 reasons.append(f"Price below VWAP ({((current_price/vwap-1)*100):.2f}%)")
             
             # EMA Trend Analysis - Exponential Moving Average alignment for trend direction
-            ema_9 = indicators['ema_9'].iloc[-1]
-            ema_21 = indicators['ema_21'].iloc[-1]
-            ema_50 = indicators['ema_50'].iloc[-1]
+            ema_9 = latest['ema_9']
+            ema_21 = latest['ema_21']
+            ema_50 = latest['ema_50']
             
             if ema_9 > ema_21 > ema_50:
                 signal += 1
@@ -681,7 +744,9 @@ Signal Sources:
                 strength += 1
                 reasons.append("EMA bearish alignment (9<21<50)")
             
-        except Exception as e:
+        except (KeyError, ValueError) as e:
+            # A missing or malformed indicator falls back to HOLD so the tick
+            # still reaches position management
             logger.error(f"Error in signal calculation: {e}")
             return {
                 'signal': 0,
@@ -697,7 +762,7 @@ Signal Sources:
             'signal': signal,
             'strength': min(strength, 5),
             'reasons': reasons,
-            'indicators': self._extract_current_indicators(indicators)
+            'indicators': latest
         }
     
     def _extract_current_indicators(self, indicators: Dict) -> Dict:
@@ -705,7 +770,8 @@ Signal Sources:
         current_indicators = {}
         for key, series in indicators.items():
             if hasattr(series, 'iloc') and len(series) > 0:
-                current_indicators[key] = float(series.iloc[-1])
+                # .values skips the positional-indexer machinery of .iloc
+                current_indicators[key] = float(series.values[-1])
         return current_indicators
     
     def check_pause_status(self) -> bool:
@@ -797,6 +863,7 @@ Signal Sources:
             logger.info(f"   Leverage: {self.leverage}x")
             
             # Place order - Execute market order on Binance
+            self._invalidate_position_cache()
             order = self.client.futures_create_order(
                 symbol=self.symbol,
                 side=side,
@@ -889,6 +956,7 @@ Signal Sources:
                 sl_side = 'BUY'
 
             # Take Profit Order
+            self._invalidate_position_cache()
             self.client.futures_create_order(
                 symbol=self.symbol,
                 side=tp_side,
@@ -899,6 +967,7 @@ Signal Sources:
             logger.info(f"🟢 Take Profit set at ${tp_price:.4f}")
 
             # Stop Loss Order
+            self._invalidate_position_cache()
             self.client.futures_create_order(
                 symbol=self.symbol,
                 side=sl_side,
@@ -936,10 +1005,26 @@ Signal Sources:
         self.position_size = 0
         self.entry_price = 0
     
+    def _get_position_information(self) -> List[Dict]:
+        """Fetch futures position information, reusing a recent snapshot
+        
+        Snapshots younger than position_cache_ttl are returned as-is. Any
+        order placement invalidates the snapshot so the next read is fresh.
+        """
+        now = time.monotonic()
+        if self._positions_cache is None or now - self._positions_cache_time > self.position_cache_ttl:
+            self._positions_cache = self.client.futures_position_information(symbol=self.symbol)
+            self._positions_cache_time = now
+        return self._positions_cache
+    
+    def _invalidate_position_cache(self):
+        """Drop the cached position snapshot after the position may have changed"""
+        self._positions_cache = None
+    
     def check_existing_positions_on_startup(self):
         """Check for existing positions on startup and warn if they exist"""
         try:
-            positions = self.client.futures_position_information(symbol=self.symbol)
+            positions = self._get_position_information()
             
             for position in positions:
                 if position['symbol'] == self.symbol:
@@ -964,7 +1049,7 @@ Signal Sources:
     def get_position_info(self):
         """Get current position information with TP/SL prices"""
         try:
-            positions = self.client.futures_position_information(symbol=self.symbol)
+            positions = self._get_position_information()
             
             for position in positions:
                 if position['symbol'] == self.symbol:
@@ -1018,7 +1103,7 @@ Signal Sources:
         """
         try:
             # Get live positions from Binance
-            positions = self.client.futures_position_information(symbol=self.symbol)
+            positions = self._get_position_information()
             live_position_amt = 0
             
             for pos in positions:
@@ -1119,6 +1204,7 @@ Signal Sources:
             close_side = 'SELL' if position_info['side'] == 'LONG' else 'BUY'
             
             # Execute market order to close position
+            self._invalidate_position_cache()
             close_order = self.client.futures_create_order(
                 symbol=self.symbol,
                 side=close_side,
@@ -1187,6 +1273,7 @@ Signal Sources:
             close_side = 'SELL' if position_info['side'] == 'LONG' else 'BUY'
             
             # Execute market order to close position
+            self._invalidate_position_cache()
             close_order = self.client.futures_create_order(
                 symbol=self.symbol,
                 side=close_side,
@@ -1235,6 +1322,8 @@ Signal Sources:
         logger.info(f"⏸️ Pause Control: Create '{self.pause_file}' file to pause trade execution")
         
         while True:
+            # Schedule from the start of the tick so slow API calls don't stretch the cadence
+            next_tick = time.monotonic() + interval
             try:
                 # Check pause status
                 paused = self.check_pause_status()
@@ -1252,23 +1341,23 @@ Signal Sources:
                 df = self.get_klines()
                 if df.empty:
                     logger.error("❌ No market data received")
-                    time.sleep(interval)
+                    time.sleep(max(0.0, next_tick - time.monotonic()))
                     continue
                 
                 # Calculate indicators
                 indicators = self.calculate_indicators(df)
                 if not indicators:
                     logger.warning("⚠️ Could not calculate indicators")
-                    time.sleep(interval)
+                    time.sleep(max(0.0, next_tick - time.monotonic()))
                     continue
                 
                 # Generate RL-enhanced signals
                 signal_data = self.generate_signals(df, indicators)
                 
                 # Current market info
-                current_price = df['close'].iloc[-1]
-                rsi = indicators['rsi'].iloc[-1] if 'rsi' in indicators else 0
-                vwap = indicators['vwap'].iloc[-1] if 'vwap' in indicators else current_price
+                current_price = df['close'].values[-1]
+                rsi = indicators['rsi'].values[-1] if 'rsi' in indicators else 0
+                vwap = indicators['vwap'].values[-1] if 'vwap' in indicators else current_price
                 
                 # Send Telegram notification for significant signals
                 if signal_data.get('signal', 0) != 0 and signal_data.get('strength', 0) > 0:
@@ -1281,31 +1370,33 @@ Signal Sources:
                 if position_info['side']:
                     pnl_emoji = "🟢" if position_info['unrealized_pnl'] > 0 else "🔴"
                     can_close_emoji = "✅" if self.can_close_position() else "🚫"
-                    logger.info(f"📍 Position: {position_info['side']} {position_info['size']:.1f} {can_close_emoji}")
-                    logger.info(f"💰 PnL: {pnl_emoji} ${position_info['unrealized_pnl']:.2f} ({position_info['percentage']:.2f}%)")
+                    logger.info("📍 Position: %s %.1f %s", position_info['side'], position_info['size'], can_close_emoji)
+                    logger.info("💰 PnL: %s $%.2f (%.2f%%)",
+                                pnl_emoji, position_info['unrealized_pnl'], position_info['percentage'])
                     
                     # Show order tracking status
                     if self.position_order_id:
-                        logger.info(f"🔢 Bot Order ID: {self.position_order_id} (Bot can manage this position)")
+                        logger.info("🔢 Bot Order ID: %s (Bot can manage this position)", self.position_order_id)
                     else:
-                        logger.info(f"🚫 No bot order ID tracked (Bot will NOT close this position)")
+                        logger.info("🚫 No bot order ID tracked (Bot will NOT close this position)")
                     
                     # Display TP/SL prices if available
                     if position_info.get('take_profit_price') or position_info.get('stop_loss_price'):
                         tp_text = f"${position_info['take_profit_price']:.4f}" if position_info.get('take_profit_price') else "Not set"
                         sl_text = f"${position_info['stop_loss_price']:.4f}" if position_info.get('stop_loss_price') else "Not set"
-                        logger.info(f"🎯 TP: {tp_text} | SL: {sl_text}")
+                        logger.info("🎯 TP: %s | SL: %s", tp_text, sl_text)
                 else:
                     logger.info("📍 Position: No open position")
                 
                 # Market status
-                logger.info(f"💹 {self.symbol}: ${current_price:.4f} | RSI: {rsi:.1f} | VWAP: ${vwap:.4f}")
+                logger.info("💹 %s: $%.4f | RSI: %.1f | VWAP: $%.4f", self.symbol, current_price, rsi, vwap)
                 
                 # Signal info
                 signal_emoji = "🟢" if signal_data['signal'] > 0 else "🔴" if signal_data['signal'] < 0 else "⚪"
                 signal_name = "BUY" if signal_data['signal'] > 0 else "SELL" if signal_data['signal'] < 0 else "HOLD"
                 pause_status = " (PAUSED)" if paused else ""
-                logger.info(f"🎯 Signal: {signal_emoji} {signal_name} (Strength: {signal_data['strength']}){pause_status}")
+                logger.info("🎯 Signal: %s %s (Strength: %s)%s",
+                            signal_emoji, signal_name, signal_data['strength'], pause_status)
                 
                 if signal_data.get('rl_enhanced'):
                     logger.info("🤖 RL Enhancement: ACTIVE")
@@ -1323,6 +1414,7 @@ Signal Sources:
                         if exit_decision['should_exit']:
                             logger.info(f"🚪 RL Exit Signal: {exit_decision['reason']}")
                             self.client.futures_cancel_all_open_orders(symbol=self.symbol)
+                            self._invalidate_position_cache()
                             close_order = self.client.futures_create_order(
                                 symbol=self.symbol,
                                 side='BUY' if position_info['side'] == 'SHORT' else 'SELL',
@@ -1360,11 +1452,12 @@ Signal Sources:
                         self.execute_trade(signal_data, current_price)
                 
                 # Log reasons
-                for reason in signal_data.get('reasons', []):
-                    logger.info(f"   • {reason}")
+                if logger.isEnabledFor(logging.INFO):
+                    for reason in signal_data.get('reasons', []):
+                        logger.info("   • %s", reason)
                 
-                logger.info(f"⏰ Next update in {interval//60} minutes...")
-                time.sleep(interval)
+                logger.info("⏰ Next update in %d minutes...", interval // 60)
+                time.sleep(max(0.0, next_tick - time.monotonic()))
                 
             except KeyboardInterrupt:
                 logger.info("👋 Bot stopped by user")
@@ -68,24 +68,35 @@ class RLEnhancedDecision:
                 - risk_level: Risk assessment (MINIMAL, LOW, MEDIUM, HIGH)
         """
         
-        # Get RL recommendation from trained model
-        rl_rec = self.rl_system.get_trading_recommendation(indicators_dict)
-        
         # Extract original signal parameters
         original_signal = original_signal_data.get('signal', 0)
         original_strength = original_signal_data.get('strength', 0)
         
+        # Every path in _make_enhanced_decision ends in HOLD without a usable
+        # traditional signal, so skip the RL lookup on flat ticks
+        if original_signal == 0 or original_strength < 1:
+            logger.info("📊 ENHANCED DECISION: HOLD (Original: Signal=%s, Strength=%s)", original_signal, original_strength)
+            return {
+                'signal': 0,
+                'strength': 0,
+                'reason': f"Safety first: Original={original_signal}, no traditional signal to confirm",
+                'risk_level': 'MINIMAL'
+            }
+        
+        # Get RL recommendation from trained model
+        rl_rec = self.rl_system.get_trading_recommendation(indicators_dict)
+        
         # Apply RL enhancement logic with safety prioritization
         enhanced_decision = self._make_enhanced_decision(
             original_signal, original_strength, rl_rec
         )
         
         # Log the complete decision process for transparency and debugging
-        logger.info(f"📊 ENHANCED DECISION:")
-        logger.info(f"   Original: Signal={original_signal}, Strength={original_strength}")
-        logger.info(f"   RL: Action={rl_rec['action']}, Confidence={rl_rec['confidence']:.1%}")
-        logger.info(f"   Final: Signal={enhanced_decision['signal']}, Strength={enhanced_decision['strength']}")
-        logger.info(f"   Reason: {enhanced_decision['reason']}")
+        logger.info("📊 ENHANCED DECISION:")
+        logger.info("   Original: Signal=%s, Strength=%s", original_signal, original_strength)
+        logger.info("   RL: Action=%s, Confidence=%.1f%%", rl_rec['action'], rl_rec['confidence'] * 100)
+        logger.info("   Final: Signal=%s, Strength=%s", enhanced_decision['signal'], enhanced_decision['strength'])
+        logger.info("   Reason: %s", enhanced_decision['reason'])
         
         return enhanced_decision
     
@@ -18,6 +18,8 @@ from openai_news_sentiment import OpenAINewsSentiment
 
 logger = logging.getLogger(__name__)
 
+NEWS_SENTIMENT_FILE = '/root/7monthIndicator/news_sentiment.json'
+
 
 class SignalDataCollector:
     """Collects and persists signal data from various sources"""
@@ -63,6 +65,17 @@ class SignalDataCollector:
             'news_sentiment': 0
         }
 
+        # news_sentiment holds the last *successful* save, tracked in memory.
+        # The saved file doubles as an on-disk cache, so its mtime only seeds
+        # it once: after a restart, skip the OpenAI request until the file is
+        # older than the interval
+        try:
+            self.last_collection['news_sentiment'] = os.path.getmtime(NEWS_SENTIMENT_FILE)
+        except OSError:
+            pass
+        # Failed news collections also wait a full interval before retrying
+        self.last_news_attempt = 0
+
     def start_collection(self):
         """Start background data collection"""
         if not self.running:
@@ -102,9 +115,10 @@ class SignalDataCollector:
                     self.last_collection['crewai'] = current_time
 
                 # Collect news sentiment
-                if current_time - self.last_collection['news_sentiment'] >= self.intervals['news_sentiment']:
+                last_news = max(self.last_collection['news_sentiment'], self.last_news_attempt)
+                if current_time - last_news >= self.intervals['news_sentiment']:
+                    self.last_news_attempt = current_time
                     self._collect_news_sentiment()
-                    self.last_collection['news_sentiment'] = current_time
 
                 # Sleep for 30 seconds before next check
                 time.sleep(30)
@@ -241,8 +255,9 @@ class SignalDataCollector:
             sentiment_result = self.sentiment_analyzer.get_news_and_sentiment(count=20)
 
             # Save to file (sentiment_result already has all the necessary fields)
-            with open('/root/7monthIndicator/news_sentiment.json', 'w') as f:
+            with open(NEWS_SENTIMENT_FILE, 'w') as f:
                 json.dump(sentiment_result, f, indent=2)
+            self.last_collection['news_sentiment'] = time.time()
 
             logger.info(f"✅ News sentiment saved: {sentiment_result['sentiment']} (score: {sentiment_result['sentiment_score']:.2f}, articles: {sentiment_result['article_count']})")
 
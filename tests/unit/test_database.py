@@ -46,9 +46,20 @@ class TestDatabaseInitialization:
 
             assert 'idx_signals_timestamp' in indexes
             assert 'idx_signals_symbol' in indexes
+            assert 'idx_signals_symbol_timestamp' in indexes
             assert 'idx_trades_timestamp' in indexes
             assert 'idx_trades_symbol' in indexes
             assert 'idx_trades_status' in indexes
+            assert 'uq_trades_manual_closure' in indexes
+            assert 'idx_market_context_created_at' in indexes
+
+    def test_wal_journal_mode(self, temp_database):
+        """Test database runs in WAL mode for concurrent readers"""
+        db = TradingDatabase(temp_database)
+        with db.get_connection() as conn:
+            assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+            # FULL: committed trades must be durable
+            assert conn.execute('PRAGMA synchronous').fetchone()[0] == 2
 
 
 @pytest.mark.unit
@@ -135,6 +146,28 @@ class TestTradeStorage:
         assert trades[0]['quantity'] == 100.0
         assert trades[0]['status'] == 'OPEN'
 
+    def test_store_trade_reused_order_id(self, temp_database, sample_signal_data):
+        """Test non-manual order IDs (e.g. reconciliation) may repeat"""
+        db = TradingDatabase(temp_database)
+        signal_id = db.store_signal('SUIUSDC', 3.55, sample_signal_data)
+
+        trade_ids = [
+            db.store_trade(
+                signal_id=signal_id,
+                symbol='SUIUSDC',
+                side='BUY',
+                quantity=100.0,
+                entry_price=3.55,
+                leverage=50,
+                position_percentage=2.0,
+                order_id='RECONCILE_35500'
+            )
+            for _ in range(2)
+        ]
+
+        assert all(trade_id > 0 for trade_id in trade_ids)
+        assert trade_ids[0] != trade_ids[1]
+
     def test_update_trade_exit(self, temp_database, sample_signal_data):
         """Test updating trade with exit information"""
         db = TradingDatabase(temp_database)
@@ -166,6 +199,28 @@ class TestTradeStorage:
         assert trades[0]['pnl'] == 15.0
         assert trades[0]['pnl_percentage'] == 4.23
 
+    def test_bulk_update_trade_exits(self, temp_database, sample_signal_data):
+        """Test closing several trades in one batch"""
+        db = TradingDatabase(temp_database)
+
+        signal_id = db.store_signal('SUIUSDC', 3.55, sample_signal_data)
+        trade1_id = db.store_trade(signal_id, 'SUIUSDC', 'BUY', 100.0, 3.55, 50, 2.0)
+        trade2_id = db.store_trade(signal_id, 'SUIUSDC', 'SELL', 50.0, 3.60, 50, 2.0)
+
+        updated = db.bulk_update_trade_exits([
+            (3.70, 15.0, 4.23, 'CLOSED', trade1_id),
+            (3.70, -5.0, -2.78, 'CLOSED', trade2_id),
+        ])
+
+        assert updated == 2
+        assert db.get_open_trades('SUIUSDC') == []
+        with db.get_connection() as conn:
+            rows = conn.execute('SELECT id, exit_price, pnl FROM trades ORDER BY id').fetchall()
+        assert [(r['id'], r['exit_price'], r['pnl']) for r in rows] == [
+            (trade1_id, 3.70, 15.0), (trade2_id, 3.70, -5.0)
+        ]
+        assert db.bulk_update_trade_exits([]) == 0
+
     def test_get_open_trades(self, temp_database, sample_signal_data):
         """Test filtering for open trades only"""
         db = TradingDatabase(temp_database)
@@ -183,6 +238,52 @@ class TestTradeStorage:
         assert len(open_trades) == 1
         assert open_trades[0]['id'] == trade1_id
 
+    def test_get_open_trades_oldest_first(self, temp_database, sample_signal_data):
+        """Test FIFO ordering of open trades"""
+        db = TradingDatabase(temp_database)
+
+        signal_id = db.store_signal('SUIUSDC', 3.55, sample_signal_data)
+        newer_id = db.store_trade(signal_id, 'SUIUSDC', 'BUY', 100.0, 3.55, 50, 2.0)
+        older_id = db.store_trade(signal_id, 'SUIUSDC', 'BUY', 50.0, 3.60, 50, 2.0)
+        with db.get_connection() as conn:
+            conn.execute("UPDATE trades SET timestamp = '2025-01-02 00:00:00' WHERE id = ?", (newer_id,))
+            conn.execute("UPDATE trades SET timestamp = '2025-01-01 00:00:00' WHERE id = ?", (older_id,))
+
+        assert [t['id'] for t in db.get_open_trades('SUIUSDC')] == [newer_id, older_id]
+        assert [t['id'] for t in db.get_open_trades('SUIUSDC', oldest_first=True)] == [older_id, newer_id]
+
+    def test_get_open_trades_arrays(self, temp_database, sample_signal_data):
+        """Test column-oriented open trades match the row API"""
+        db = TradingDatabase(temp_database)
+
+        assert len(db.get_open_trades_arrays('SUIUSDC')) == 0
+
+        signal_id = db.store_signal('SUIUSDC', 3.55, sample_signal_data)
+        db.store_trade(signal_id, 'SUIUSDC', 'BUY', 100.0, 3.55, 50, 2.0)
+        db.store_trade(signal_id, 'SUIUSDC', 'SELL', 50.0, 3.60, 50, 2.0)
+
+        trades = db.get_open_trades('SUIUSDC', oldest_first=True)
+        arrays = db.get_open_trades_arrays('SUIUSDC', oldest_first=True)
+        assert arrays.tolist() == [
+            (t['id'], t['side'], t['quantity'], t['entry_price']) for t in trades
+        ]
+
+    def test_get_position_summary(self, temp_database, sample_signal_data):
+        """Test net position and counts per status"""
+        db = TradingDatabase(temp_database)
+
+        assert db.get_position_summary('SUIUSDC') == {'OPEN': (0.0, 0), 'CLOSED': (0.0, 0)}
+
+        signal_id = db.store_signal('SUIUSDC', 3.55, sample_signal_data)
+        db.store_trade(signal_id, 'SUIUSDC', 'BUY', 100.0, 3.55, 50, 2.0)
+        db.store_trade(signal_id, 'SUIUSDC', 'SELL', 30.0, 3.60, 50, 2.0)
+        closed_id = db.store_trade(signal_id, 'SUIUSDC', 'BUY', 50.0, 3.60, 50, 2.0)
+        db.update_trade_exit(closed_id, 3.65, 2.5, 1.39, 'CLOSED')
+
+        summary = db.get_position_summary('SUIUSDC')
+        assert summary['OPEN'] == (70.0, 2)
+        assert summary['CLOSED'] == (50.0, 1)
+
 
 @pytest.mark.unit
 class TestPerformanceMetrics:
@@ -328,6 +429,52 @@ class TestManualClosures:
         result2 = db.record_manual_closure(closure, 'SUIUSDC')
         assert result2 == False
 
+    def test_record_partial_closures_same_second(self, temp_database):
+        """Test partial closes of different amounts in the same second are all recorded"""
+        db = TradingDatabase(temp_database)
+
+        for amount in (200.0, 300.0):
+            closure = {
+                'timestamp': '2025-01-01 12:00:00',
+                'type': 'PARTIAL_CLOSE',
+                'amount': amount,
+                'entry_price': 3.50,
+                'exit_price': 3.70
+            }
+            assert db.record_manual_closure(closure, 'SUIUSDC') == True
+
+        with db.get_connection() as conn:
+            count = conn.execute("SELECT COUNT(*) FROM trades WHERE order_id GLOB 'MANUAL_*'").fetchone()[0]
+        assert count == 2
+
+
+@pytest.mark.unit
+class TestCleanup:
+    """Test retention-based data cleanup"""
+
+    def test_cleanup_old_data_in_chunks(self, temp_database):
+        """Test old signals are removed across multiple delete batches"""
+        db = TradingDatabase(temp_database)
+
+        with db.get_connection() as conn:
+            conn.executemany(
+                "INSERT INTO signals (timestamp, symbol, price, signal, strength) "
+                "VALUES (datetime('now', '-200 days'), 'SUIUSDC', 3.5, 0, 0)",
+                [()] * 25
+            )
+            conn.execute(
+                "INSERT INTO signals (symbol, price, signal, strength) VALUES ('SUIUSDC', 3.5, 1, 3)"
+            )
+
+        with db.get_connection() as conn:
+            deleted = db._chunked_delete(
+                conn, 'signals', "timestamp < datetime('now', '-90 days')", chunk=10
+            )
+            remaining = conn.execute('SELECT COUNT(*) FROM signals').fetchone()[0]
+
+        assert deleted == 25
+        assert remaining == 1
+
 
 @pytest.mark.unit
 def test_singleton_database(temp_database):
@@ -336,3 +483,64 @@ def test_singleton_database(temp_database):
     db2 = get_database(temp_database)
 
     assert db1 is db2
+
+
+@pytest.mark.unit
+def test_database_instance_per_path(tmp_path):
+    """Test that get_database keeps a separate instance per database path"""
+    db1 = get_database(str(tmp_path / "first.db"))
+    db2 = get_database(str(tmp_path / "second.db"))
+
+    assert db1 is not db2
+    assert db1.db_path != db2.db_path
+
+
+@pytest.mark.unit
+def test_connection_per_thread(temp_database):
+    """Test each thread reuses its own connection until close()"""
+    import threading
+
+    db = TradingDatabase(temp_database)
+    with db.get_connection() as conn1:
+        pass
+    with db.get_connection() as conn2:
+        pass
+    assert conn1 is conn2
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(db._thread_connection()))
+    thread.start()
+    thread.join()
+    assert other[0] is not conn1
+
+    db.close()
+    with db.get_connection() as conn3:
+        assert conn3 is not conn1
+        assert conn3.execute('SELECT COUNT(*) FROM trades').fetchone()[0] == 0
+
+
+@pytest.mark.unit
+def test_nested_connection_blocks(temp_database):
+    """Test a nested get_connection() block can't commit or discard the outer one"""
+    db = TradingDatabase(temp_database)
+    insert = "INSERT INTO signals (symbol, price, signal, strength) VALUES (?, 3.5, 0, 0)"
+
+    # Inner failure rolls back only the inner insert
+    with db.get_connection() as conn:
+        conn.execute(insert, ('OUTER',))
+        with pytest.raises(ValueError):
+            with db.get_connection() as inner:
+                inner.execute(insert, ('INNER',))
+                raise ValueError('inner failure')
+
+    # Outer failure also discards the inner block's insert
+    with pytest.raises(ValueError):
+        with db.get_connection() as conn:
+            conn.execute(insert, ('LOST',))
+            with db.get_connection() as inner:
+                inner.execute(insert, ('LOST',))
+            raise ValueError('outer failure')
+
+    with db.get_connection() as conn:
+        symbols = [row['symbol'] for row in conn.execute('SELECT symbol FROM signals')]
+    assert symbols == ['OUTER']
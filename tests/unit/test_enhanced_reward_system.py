@@ -0,0 +1,54 @@
+"""
+Unit tests for enhanced_reward_system.py - EnhancedRewardCalculator class
+
+Tests that reward parameters changed on an existing calculator take effect
+on the next reward.
+"""
+
+import pytest
+from enhanced_reward_system import EnhancedRewardCalculator, TradeMetrics
+
+
+def make_trade(pnl_pct):
+    """Build a closed trade with the given return"""
+    return TradeMetrics(
+        pnl_pct=pnl_pct, pnl_amount=pnl_pct * 100, entry_price=1.0,
+        exit_price=1.0 + pnl_pct, position_type='LONG', duration_minutes=30,
+        max_adverse_excursion=-0.01, max_favorable_excursion=0.02,
+        volatility_at_entry=0.01
+    )
+
+
+@pytest.mark.unit
+class TestRewardParameters:
+    """Test reassigning reward parameters on an existing calculator"""
+
+    def test_streak_bonus_cap_applies_to_next_reward(self):
+        """Test a new streak cap changes the next reward without another trade"""
+        calc = EnhancedRewardCalculator()
+        for _ in range(10):
+            calc.calculate_enhanced_reward(trade_metrics=make_trade(0.02), action='CLOSE')
+
+        before = calc.calculate_enhanced_reward(action='BUY', rsi=50)
+        calc.streak_bonus_cap = 1.0
+        after = calc.calculate_enhanced_reward(action='BUY', rsi=50)
+
+        assert calc._cached_streak_factor == 1.0
+        assert after != before
+        assert after == pytest.approx(-0.001 + calc._cached_dd_penalty
+                                      + calc._cached_heat_penalty + calc._cached_sharpe_bonus)
+
+    def test_drawdown_penalty_multiplier_applies_to_next_reward(self):
+        """Test a new drawdown multiplier changes the next reward without another trade"""
+        calc = EnhancedRewardCalculator()
+        calc.calculate_enhanced_reward(trade_metrics=make_trade(0.10), action='CLOSE')
+        calc.calculate_enhanced_reward(trade_metrics=make_trade(-0.20), action='CLOSE')
+        drawdown = calc.portfolio_metrics.current_drawdown
+        assert drawdown > 0.05
+
+        before = calc.calculate_enhanced_reward(action='HOLD', rsi=50)
+        calc.drawdown_penalty_multiplier = 6.0
+        after = calc.calculate_enhanced_reward(action='HOLD', rsi=50)
+
+        assert calc._cached_dd_penalty == pytest.approx(-drawdown * 6.0)
+        assert after - before == pytest.approx(-drawdown * 3.0)
@@ -26,6 +26,7 @@ warnings.filterwarnings('ignore')
 
 # Import database module
 from database import get_database
+from exchange_info import FILTER_ERROR_CODES, SymbolInfoCache
 
 # Load environment variables
 load_dotenv()
@@ -116,6 +117,7 @@ class BinanceFuturesBot:
         self.position_size = 0
         self.position_side = None
         self.indicators = TechnicalIndicators()
+        self.symbol_info = SymbolInfoCache(self.client, self.symbol)
         
         # Initialize database
         self.db = get_database()
@@ -347,12 +349,8 @@ class BinanceFuturesBot:
             account_info = self.client.futures_account()
             
             # Get quote asset from symbol (e.g., USDC from SUIUSDC)
-            exchange_info = self.client.futures_exchange_info()
-            quote_asset = None
-            for s in exchange_info['symbols']:
-                if s['symbol'] == self.symbol:
-                    quote_asset = s['quoteAsset']
-                    break
+            symbol_info = self.symbol_info.get()
+            quote_asset = symbol_info['quoteAsset'] if symbol_info else None
             
             if not quote_asset:
                 logger.error(f"Could not find quote asset for {self.symbol}")
@@ -383,14 +381,10 @@ class BinanceFuturesBot:
             # Calculate quantity in base asset (SUI)
             position_size = leveraged_position_value / current_price
             
-            # Get symbol info for proper rounding
-            symbol_info = self.client.futures_exchange_info()
-            for s in symbol_info['symbols']:
-                if s['symbol'] == self.symbol:
-                    step_size = float(s['filters'][1]['stepSize'])
-                    precision = len(str(step_size).rstrip('0').split('.')[-1])
-                    position_size = round(position_size, precision)
-                    break
+            # Round to the symbol's lot step size
+            step_size = float(symbol_info['filters'][1]['stepSize'])
+            precision = len(str(step_size).rstrip('0').split('.')[-1])
+            position_size = round(position_size, precision)
             
             logger.info(f"💰 Position Calc: {self.position_percentage}% of {available_balance:.2f} {quote_asset} = {position_value:.2f} {quote_asset}")
             logger.info(f"⚡ With {self.leverage}x leverage: {leveraged_position_value:.2f} {quote_asset} → {position_size:.4f} SUI")
@@ -440,15 +434,12 @@ class BinanceFuturesBot:
             tp_sl_prices = self.calculate_tp_sl_prices(entry_price, side)
             
             # Get symbol info for price precision
-            exchange_info = self.client.futures_exchange_info()
+            symbol_info = self.symbol_info.get()
             price_precision = 2  # Default
-            for s in exchange_info['symbols']:
-                if s['symbol'] == self.symbol:
-                    for f in s['filters']:
-                        if f['filterType'] == 'PRICE_FILTER':
-                            tick_size = float(f['tickSize'])
-                            price_precision = len(str(tick_size).rstrip('0').split('.')[-1])
-                            break
+            for f in (symbol_info['filters'] if symbol_info else []):
+                if f['filterType'] == 'PRICE_FILTER':
+                    tick_size = float(f['tickSize'])
+                    price_precision = len(str(tick_size).rstrip('0').split('.')[-1])
                     break
             
             # Round prices to proper precision
@@ -582,6 +573,9 @@ class BinanceFuturesBot:
             
         except BinanceAPIException as e:
             logger.error(f"Error executing trade: {e}")
+            if e.code in FILTER_ERROR_CODES:
+                # The symbol's filters may have changed; refetch them before the next order
+                self.symbol_info.invalidate()
             return False
     
     def get_position_info(self) -> Dict:
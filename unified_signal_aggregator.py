@@ -46,6 +46,14 @@ class UnifiedSignalAggregator:
         self.market_context_ttl = timedelta(minutes=10)
         self.news_sentiment_ttl = timedelta(hours=1)
 
+        # Per-source weights as attributes so the per-tick sum skips dict lookups
+        self._w_technical = self.WEIGHTS['technical']
+        self._w_rl = self.WEIGHTS['rl']
+        self._w_chart = self.WEIGHTS['chart_analysis']
+        self._w_crewai = self.WEIGHTS['crewai']
+        self._w_market = self.WEIGHTS['market_context']
+        self._w_news = self.WEIGHTS['news_sentiment']
+
     def aggregate_signals(
         self,
         technical_signal: Dict,
@@ -66,6 +74,7 @@ class UnifiedSignalAggregator:
             Dict with unified signal, strength (0-10), confidence, and breakdown
         """
         logger.info("=== Starting Unified Signal Aggregation ===")
+        log_info = logger.isEnabledFor(logging.INFO)
 
         signals = {}
         scores = {}
@@ -76,59 +85,74 @@ class UnifiedSignalAggregator:
         signals['technical'] = technical_signal
         scores['technical'] = tech_score
         confidences['technical'] = tech_conf
-        logger.info(f"Technical Score: {tech_score:.2f}/10 (confidence: {tech_conf:.1f}%)")
+        if log_info:
+            logger.info(f"Technical Score: {tech_score:.2f}/10 (confidence: {tech_conf:.1f}%)")
 
         # 2. RL Enhancement (Layer 2)
         rl_score, rl_conf = self._score_rl_signal(rl_signal)
         signals['rl'] = rl_signal
         scores['rl'] = rl_score
         confidences['rl'] = rl_conf
-        logger.info(f"RL Score: {rl_score:.2f}/10 (confidence: {rl_conf:.1f}%)")
+        if log_info:
+            logger.info(f"RL Score: {rl_score:.2f}/10 (confidence: {rl_conf:.1f}%)")
 
         # 3. Chart Analysis
         chart_score, chart_conf = self._score_chart_analysis(symbol)
         signals['chart_analysis'] = self.last_chart_analysis
         scores['chart_analysis'] = chart_score
         confidences['chart_analysis'] = chart_conf
-        logger.info(f"Chart Analysis Score: {chart_score:.2f}/10 (confidence: {chart_conf:.1f}%)")
+        if log_info:
+            logger.info(f"Chart Analysis Score: {chart_score:.2f}/10 (confidence: {chart_conf:.1f}%)")
 
         # 4. CrewAI Multi-Agent
         crewai_score, crewai_conf = self._score_crewai_signal(symbol)
         signals['crewai'] = self.last_crewai_signal
         scores['crewai'] = crewai_score
         confidences['crewai'] = crewai_conf
-        logger.info(f"CrewAI Score: {crewai_score:.2f}/10 (confidence: {crewai_conf:.1f}%)")
+        if log_info:
+            logger.info(f"CrewAI Score: {crewai_score:.2f}/10 (confidence: {crewai_conf:.1f}%)")
 
         # 5. Market Context & Cross-Asset
         market_score, market_conf = self._score_market_context()
         signals['market_context'] = self.last_market_context
         scores['market_context'] = market_score
         confidences['market_context'] = market_conf
-        logger.info(f"Market Context Score: {market_score:.2f}/10 (confidence: {market_conf:.1f}%)")
+        if log_info:
+            logger.info(f"Market Context Score: {market_score:.2f}/10 (confidence: {market_conf:.1f}%)")
 
         # 6. News Sentiment
         news_score, news_conf = self._score_news_sentiment(symbol)
         signals['news_sentiment'] = self.last_news_sentiment
         scores['news_sentiment'] = news_score
         confidences['news_sentiment'] = news_conf
-        logger.info(f"News Sentiment Score: {news_score:.2f}/10 (confidence: {news_conf:.1f}%)")
+        if log_info:
+            logger.info(f"News Sentiment Score: {news_score:.2f}/10 (confidence: {news_conf:.1f}%)")
 
         # Calculate weighted score
-        weighted_score = sum(
-            scores[key] * self.WEIGHTS[key]
-            for key in scores.keys()
+        weighted_score = (
+            tech_score * self._w_technical
+            + rl_score * self._w_rl
+            + chart_score * self._w_chart
+            + crewai_score * self._w_crewai
+            + market_score * self._w_market
+            + news_score * self._w_news
         )
 
         # Calculate overall confidence (weighted average)
-        overall_confidence = sum(
-            confidences[key] * self.WEIGHTS[key]
-            for key in confidences.keys()
+        overall_confidence = (
+            tech_conf * self._w_technical
+            + rl_conf * self._w_rl
+            + chart_conf * self._w_chart
+            + crewai_conf * self._w_crewai
+            + market_conf * self._w_market
+            + news_conf * self._w_news
         )
 
         # Determine unified signal
         unified_signal = self._determine_signal(weighted_score, overall_confidence)
 
-        logger.info(f"=== UNIFIED RESULT: {unified_signal} | Strength: {weighted_score:.2f}/10 | Confidence: {overall_confidence:.1f}% ===")
+        if log_info:
+            logger.info(f"=== UNIFIED RESULT: {unified_signal} | Strength: {weighted_score:.2f}/10 | Confidence: {overall_confidence:.1f}% ===")
 
         return {
             'signal': unified_signal,
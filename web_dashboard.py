@@ -15,6 +15,8 @@ and analysis for the RL-enhanced trading bot. Features include:
 - RL decision analysis and insights
 """
 
+import gzip
+import hashlib
 import json
 import os
 import time
@@ -38,18 +40,23 @@ if not os.getenv('NEWS_API_KEY'):
     import dotenv
     dotenv.load_dotenv('.env', override=True)
 
+# Shared local analyzer so its result cache survives across requests
+local_sentiment_analyzer = None
+
 def analyze_market_sentiment(news_titles):
     """
     Analyze market sentiment using OpenAI or local analysis based on configuration
     """
+    global local_sentiment_analyzer
     try:
         # Check if we should use local analysis (cost-saving mode)
         use_local_sentiment = os.getenv('USE_LOCAL_SENTIMENT', 'false').lower() == 'true'
         
         if use_local_sentiment:
-            from local_sentiment import LocalSentimentAnalyzer
-            analyzer = LocalSentimentAnalyzer()
-            result = analyzer.analyze_sentiment(news_titles)
+            if local_sentiment_analyzer is None:
+                from local_sentiment import LocalSentimentAnalyzer
+                local_sentiment_analyzer = LocalSentimentAnalyzer()
+            result = local_sentiment_analyzer.analyze_sentiment(news_titles)
             logger.info("Using local sentiment analysis (cost-saving mode)")
             return result
         
@@ -151,6 +158,58 @@ logger = logging.getLogger(__name__)
 # Global variable to track PIN failed attempts with rate limiting
 pin_attempts = {}
 
+# Last /api/system-stats result as (file signature, etag, stats); replaced
+# as one tuple so concurrent requests never mix parts of two results
+system_stats_cache = {'entry': None}
+
+def database_file_signature(db_path: str) -> tuple:
+    """(mtime_ns, size) of the database file and its WAL
+
+    Any committed write changes the WAL (or, after a checkpoint, the main
+    file), so an unchanged signature means query results are unchanged.
+    """
+    signature = []
+    for path in (db_path, db_path + '-wal'):
+        try:
+            st = os.stat(path)
+            signature.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+# JSON bodies smaller than this go out uncompressed; gzip overhead outweighs the gain
+GZIP_MIN_SIZE = 1024
+
+@app.after_request
+def compress_json_response(response):
+    """Gzip larger JSON responses for clients that accept it"""
+    if (response.mimetype != 'application/json'
+            or response.status_code != 200
+            or response.direct_passthrough
+            or response.is_streamed
+            or 'Content-Encoding' in response.headers):
+        return response
+    
+    data = response.get_data()
+    if len(data) < GZIP_MIN_SIZE:
+        return response
+    
+    # From here the body depends on Accept-Encoding, compressed or not
+    response.vary.add('Accept-Encoding')
+    # Quality-aware lookup: 'gzip;q=0' explicitly refuses gzip
+    if not request.accept_encodings['gzip']:
+        return response
+    
+    # Level 1: most of the size reduction on repetitive JSON for little CPU
+    response.set_data(gzip.compress(data, compresslevel=1))
+    response.headers['Content-Encoding'] = 'gzip'
+    
+    # The encoded bytes differ from the identity body, so a strong ETag becomes weak
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
 def validate_6_digit_pin(provided_pin: str, client_ip: str) -> dict:
     """
     Validate 6-digit PIN against environment variable with rate limiting
@@ -301,10 +360,10 @@ def get_performance(symbol):
                         query = '''
                             SELECT * FROM trades 
                             WHERE symbol = ? AND status = 'OPEN' 
-                            AND timestamp >= datetime('now', '-{} days')
-                        '''.format(days)
+                            AND timestamp >= datetime('now', ?)
+                        '''
                         
-                        cursor = conn.execute(query, (symbol,))
+                        cursor = conn.execute(query, (symbol, f'-{days} days'))
                         open_trades = [dict(row) for row in cursor.fetchall()]
                         
                         if open_trades:
@@ -543,36 +602,36 @@ def get_chart_data(symbol):
     
     try:
         with db.get_connection() as conn:
-            # Get closed trades for PnL chart
-            trades_query = '''
+            # Get closed trades for PnL chart. The window is bound as a
+            # parameter so the SQL text is constant and sqlite3 reuses the
+            # prepared statement on this thread's connection.
+            since = f'-{days} days'
+            cursor = conn.execute('''
                 SELECT timestamp, pnl, side, quantity, entry_price, exit_price
                 FROM trades 
                 WHERE symbol = ? AND status = 'CLOSED'
-                AND timestamp >= datetime('now', '-{} days')
+                AND timestamp >= datetime('now', ?)
                 ORDER BY timestamp
-            '''.format(days)
-            
-            cursor = conn.execute(trades_query, (symbol,))
+            ''', (symbol, since))
             trades = []
             cumulative_pnl = 0
             
-            for row in cursor.fetchall():
+            # Iterate the cursor directly instead of materializing fetchall()
+            for row in cursor:
                 trade = dict(row)
                 cumulative_pnl += trade['pnl'] or 0
                 trade['cumulative_pnl'] = cumulative_pnl
                 trades.append(trade)
             
             # Get signals for signal strength chart
-            signals_query = '''
+            cursor = conn.execute('''
                 SELECT timestamp, signal, strength, price
                 FROM signals
                 WHERE symbol = ? 
-                AND timestamp >= datetime('now', '-{} days')
+                AND timestamp >= datetime('now', ?)
                 ORDER BY timestamp
-            '''.format(days)
-            
-            cursor = conn.execute(signals_query, (symbol,))
-            signals = [dict(row) for row in cursor.fetchall()]
+            ''', (symbol, since))
+            signals = [dict(row) for row in cursor]
             
             return jsonify({
                 'success': True,
@@ -605,31 +664,35 @@ def get_system_stats():
     db = get_database()
     
     try:
-        with db.get_connection() as conn:
-            # Get total counts
-            stats = {}
-            
-            cursor = conn.execute('SELECT COUNT(*) as count FROM signals')
-            stats['total_signals'] = cursor.fetchone()['count']
-            
-            cursor = conn.execute('SELECT COUNT(*) as count FROM trades')
-            stats['total_trades'] = cursor.fetchone()['count']
-            
-            cursor = conn.execute('SELECT COUNT(*) as count FROM trades WHERE status = "OPEN"')
-            stats['open_trades'] = cursor.fetchone()['count']
-            
-            # Get last signal time
-            cursor = conn.execute('SELECT MAX(timestamp) as last_signal FROM signals')
-            stats['last_signal'] = cursor.fetchone()['last_signal']
-            
-            # Get symbols
-            cursor = conn.execute('SELECT DISTINCT symbol FROM signals ORDER BY symbol')
-            stats['symbols'] = [row['symbol'] for row in cursor.fetchall()]
+        # Serve repeated polls from cache while the database is unchanged
+        signature = database_file_signature(db.db_path)
+        entry = system_stats_cache['entry']
+        if entry is None or entry[0] != signature:
+            with db.get_connection() as conn:
+                # Get total counts and last signal time in one statement
+                cursor = conn.execute('''
+                    SELECT (SELECT COUNT(*) FROM signals) as total_signals,
+                           (SELECT COUNT(*) FROM trades) as total_trades,
+                           (SELECT COUNT(*) FROM trades WHERE status = 'OPEN') as open_trades,
+                           (SELECT MAX(timestamp) FROM signals) as last_signal
+                ''')
+                stats = dict(cursor.fetchone())
+                
+                # Get symbols
+                cursor = conn.execute('SELECT DISTINCT symbol FROM signals ORDER BY symbol')
+                stats['symbols'] = [row['symbol'] for row in cursor.fetchall()]
             
-            return jsonify({
-                'success': True,
-                'data': stats
-            })
+            etag = hashlib.blake2b(repr(signature).encode(), digest_size=8).hexdigest()
+            entry = system_stats_cache['entry'] = (signature, etag, stats)
+        
+        _, etag, stats = entry
+        response = jsonify({
+            'success': True,
+            'data': stats
+        })
+        # Clients sending If-None-Match with the current ETag get a 304
+        response.set_etag(etag)
+        return response.make_conditional(request)
             
     except Exception as e:
         logger.error(f"Error getting system stats: {e}")
@@ -729,10 +792,10 @@ def get_projected_balance(symbol):
                     SUM(CASE WHEN pnl IS NOT NULL THEN pnl ELSE 0 END) as daily_pnl,
                     COUNT(CASE WHEN status = 'CLOSED' THEN 1 END) as trades_closed
                 FROM trades 
-                WHERE symbol = ? AND timestamp >= date('now', '-{} days')
+                WHERE symbol = ? AND timestamp >= date('now', ?)
                 GROUP BY DATE(timestamp)
                 ORDER BY date
-            '''.format(days), (symbol,))
+            ''', (symbol, f'-{days} days'))
             
             daily_performance = cursor.fetchall()
         
@@ -2089,12 +2152,12 @@ def get_spike_detections():
 
             query = '''
                 SELECT * FROM spike_detections
-                WHERE timestamp >= datetime('now', '-{} hours')
+                WHERE timestamp >= datetime('now', ?)
                 ORDER BY timestamp DESC
                 LIMIT ?
-            '''.format(hours)
+            '''
 
-            cursor = conn.execute(query, (limit,))
+            cursor = conn.execute(query, (f'-{hours} hours', limit))
             spikes = []
             for row in cursor.fetchall():
                 spike = dict(row)